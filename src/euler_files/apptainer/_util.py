@@ -0,0 +1,102 @@
+"""Small helpers shared by the apptainer subcommands."""
+
+from __future__ import annotations
+
+import os
+import shutil
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional, Sequence
+
+from euler_files.fsutil import format_size
+
+if TYPE_CHECKING:
+    from rich.console import Console
+
+
+def _file_size_display(path: Path) -> str:
+    """Get human-readable file size."""
+    try:
+        return format_size(path.stat().st_size)
+    except OSError:
+        return "?"
+
+
+def _interactive_pick(
+    title: str,
+    names: Sequence[str],
+    columns: Sequence[str],
+    rows: Sequence[Sequence[str]],
+    prompt: str,
+    noun: str,
+    border_style: str = "blue",
+) -> Optional[int]:
+    """Show a numbered table of choices and ask the user to pick one.
+
+    Each of ``names`` gets a row made of its number, its name and the
+    matching entry of ``rows`` (one cell per extra column in ``columns``).
+    The answer may be a number or a name. Returns the index of the chosen
+    entry, or None (after reporting it) if the answer matches nothing.
+    """
+    from rich.prompt import Prompt
+    from rich.table import Table
+
+    console = _console()
+    console.print()
+    table = Table(title=title, border_style=border_style)
+    table.add_column("#", style="dim", justify="right")
+    table.add_column("Name", style="bold")
+    for column in columns:
+        table.add_column(column)
+
+    for i, (name, row) in enumerate(zip(names, rows), 1):
+        table.add_row(str(i), name, *row)
+
+    console.print(table)
+    console.print()
+
+    choice = Prompt.ask(prompt, console=console)
+
+    # Try as number first
+    try:
+        idx = int(choice) - 1
+        if 0 <= idx < len(names):
+            return idx
+    except ValueError:
+        pass
+
+    # Try as name
+    if choice in names:
+        return list(names).index(choice)
+
+    _err(f"Unknown {noun}: {choice}")
+    return None
+
+
+def _which(name: str) -> Optional[str]:
+    """shutil.which() memoised on the current $PATH.
+
+    Module-loaded PATHs on clusters are long and often on network
+    filesystems, so repeated lookups aren't free.
+    """
+    return _which_cached(name, os.environ.get("PATH", os.defpath))
+
+
+@lru_cache(maxsize=16)
+def _which_cached(name: str, path: str) -> Optional[str]:
+    return shutil.which(name, path=path)
+
+
+def _err(msg: str) -> None:
+    """Print to stderr."""
+    print(msg, file=sys.stderr)
+
+
+@lru_cache(maxsize=None)
+def _console() -> Console:
+    """Stderr console, created on first use so rich is only imported on the
+    code paths that actually render something."""
+    from rich.console import Console
+
+    return Console(stderr=True)
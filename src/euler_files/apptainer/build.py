@@ -2,27 +2,25 @@
 
 from __future__ import annotations
 
+import hashlib
 import os
+import shutil
 import subprocess
 import sys
+import tempfile
 import time
 from pathlib import Path
 from typing import Optional
 
-from rich.console import Console
-from rich.prompt import Prompt
-from rich.table import Table
-
 from euler_files.config import (
     ApptainerImageConfig,
     load_config,
     save_config,
 )
+from euler_files.apptainer._util import _err, _file_size_display, _interactive_pick, _which
 from euler_files.apptainer.deffile import generate_def_file
 from euler_files.apptainer.venv import VenvInfo, detect_python_version, list_venvs, validate_venv
 
-console = Console(stderr=True)
-
 
 def run_build(
     venv_name: Optional[str] = None,
@@ -44,17 +42,24 @@ def run_build(
         )
 
     apt = config.apptainer
-    venv_base = Path(os.path.expandvars(os.path.expanduser(apt.venv_base)))
+    venv_base = apt.venv_base_path()
 
-    # Resolve which venv to build
+    # Resolve which venv to build. The interactive picker has already parsed
+    # pyvenv.cfg for every candidate, so reuse its result instead of reading
+    # the chosen venv's config a second time.
+    venv_info: Optional[VenvInfo] = None
     if venv_name is None:
-        venv_name = _interactive_select(venv_base, apt)
-        if venv_name is None:
+        venv_info = _interactive_select(venv_base, apt)
+        if venv_info is None:
             return
+        venv_name = venv_info.name
 
     venv_path = venv_base / venv_name
     validate_venv(venv_path)
-    python_version = detect_python_version(venv_path)
+    if venv_info is not None:
+        python_version = venv_info.python_version
+    else:
+        python_version = detect_python_version(venv_path)
 
     _err(f"euler-files: building apptainer image for '{venv_name}'")
     _err(f"  venv: {venv_path}")
@@ -67,15 +72,23 @@ def run_build(
     sif_filename = f"{venv_name}.sif"
     sif_path = sif_store / sif_filename
     def_path = sif_store / f"{venv_name}.def"
-    tar_path = sif_store / f"{venv_name}.tar"
 
-    # Check existing .sif
+    # Check existing .sif. An image recorded with a different fingerprint
+    # was built from an older state of the venv, so rebuild it. The venv is
+    # only walked when there is a recorded fingerprint to compare against.
+    content_hash: Optional[str] = None
     if sif_path.exists() and not force:
-        _err(f"  [SKIP] {sif_path} already exists. Use --force to rebuild.")
-        return
+        recorded = apt.images.get(venv_name)
+        if recorded is not None and recorded.content_hash:
+            content_hash = _venv_content_hash(venv_path)
+        if recorded is None or recorded.content_hash in ("", content_hash):
+            _err(f"  [SKIP] {sif_path} already exists. Use --force to rebuild.")
+            return
+        _err(f"  [STALE] {venv_path} changed since {sif_path} was built, rebuilding.")
 
     if dry_run:
         # Generate def content with placeholder tar path for display
+        tar_path = Path(tempfile.gettempdir()) / "euler-files-XXXXXX" / f"{venv_name}.tar"
         def_content = generate_def_file(
             venv_name=venv_name,
             tar_path=str(tar_path),
@@ -92,16 +105,36 @@ def run_build(
         _err(f"\n  Command: {' '.join(cmd)}")
         return
 
+    # Resolve apptainer before packing: a missing binary should fail in
+    # milliseconds, not after tarring a few hundred MB.
+    apptainer = _which("apptainer")
+    if apptainer is None:
+        raise FileNotFoundError(
+            "apptainer not found. Try loading it first: module load apptainer"
+        )
+
+    # Fingerprint the venv before packing it: if it changes while tar runs,
+    # the stored hash is already stale and the next build picks that up.
+    if content_hash is None:
+        content_hash = _venv_content_hash(venv_path)
+
     # Step 1: Pre-pack the venv into a tarball
     # This is dramatically faster on shared HPC filesystems than letting
     # apptainer's %files copy thousands of individual files. tar reads
     # sequentially (one open, one stream) while %files does per-file
     # stat+open+read — tens of thousands of metadata operations.
     _err(f"  [TAR] Packing venv into tarball...")
+    tar_path = _stage_tarball(venv_path, venv_name, fallback_dir=sif_store)
     _err(f"    {venv_path} -> {tar_path}")
-    _create_tarball(venv_path, tar_path)
     _err(f"  [TAR] Done ({_file_size_display(tar_path)})")
 
+    # When the tarball landed in node-local staging, build the image there
+    # too and only copy the finished .sif to sif_store. That keeps
+    # apptainer's writes off the shared FS, never leaves a half-written .sif
+    # in the store, and swaps the new image in atomically.
+    staging_dir = tar_path.parent if tar_path.parent != sif_store else None
+    build_path = staging_dir / sif_filename if staging_dir else sif_path
+
     try:
         # Step 2: Generate definition file (references the tarball)
         def_content = generate_def_file(
@@ -115,28 +148,29 @@ def run_build(
         _err(f"  definition: {def_path}")
 
         # Step 3: Build the image
-        cmd = ["apptainer", "build", *apt.build_args, str(sif_path), str(def_path)]
+        cmd = [apptainer, "build", *apt.build_args, str(build_path), str(def_path)]
         _err(f"  command: {' '.join(cmd)}")
         _err("")
 
-        try:
-            result = subprocess.run(
-                cmd,
-                stdout=sys.stderr,
-                stderr=sys.stderr,
-            )
-        except FileNotFoundError:
-            raise FileNotFoundError(
-                "apptainer not found. Try loading it first: module load apptainer"
-            )
+        result = subprocess.run(
+            cmd,
+            stdout=sys.stderr,
+            stderr=sys.stderr,
+        )
 
         if result.returncode != 0:
             raise RuntimeError(f"apptainer build failed with exit code {result.returncode}")
+
+        if build_path != sif_path:
+            _err(f"  [COPY] {build_path} -> {sif_path}")
+            _install_sif(build_path, sif_path)
     finally:
         # Step 4: Clean up the tarball (can be very large)
         if tar_path.exists():
             _err(f"  [CLEANUP] Removing tarball {tar_path}")
             tar_path.unlink()
+        if staging_dir is not None:
+            shutil.rmtree(staging_dir, ignore_errors=True)
 
     # Update config with image metadata
     apt.images[venv_name] = ApptainerImageConfig(
@@ -144,6 +178,7 @@ def run_build(
         python_version=python_version,
         sif_filename=sif_filename,
         built_at=time.time(),
+        content_hash=content_hash,
     )
     save_config(config, path=config_path)
 
@@ -152,6 +187,78 @@ def run_build(
     _err("  Run 'euler-files apptainer sync' to copy to scratch.")
 
 
+def _venv_content_hash(venv_path: Path) -> str:
+    """Fingerprint a venv from its file metadata (paths, sizes, mtimes).
+
+    Contents aren't read: installing, upgrading or removing a package
+    always changes the metadata of the files involved, and hashing a few
+    hundred MB just to skip a build would cost about as much as the build.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    stack = [venv_path]
+    while stack:
+        directory = stack.pop()
+        with os.scandir(directory) as it:
+            entries = sorted(it, key=lambda e: e.name)
+        for entry in entries:
+            st = entry.stat(follow_symlinks=False)
+            h.update(os.fsencode(os.path.relpath(entry.path, venv_path)))
+            if entry.is_symlink():
+                h.update(b"\0L" + os.fsencode(os.readlink(entry.path)))
+            elif entry.is_dir(follow_symlinks=False):
+                h.update(b"\0D")
+                stack.append(Path(entry.path))
+            else:
+                h.update(b"\0F%d:%d" % (st.st_size, st.st_mtime_ns))
+            h.update(b"\n")
+    return h.hexdigest()
+
+
+def _stage_tarball(venv_path: Path, venv_name: str, fallback_dir: Path) -> Path:
+    """Pack the venv into a tarball, preferring node-local temp storage.
+
+    The tarball is written once and read back once by apptainer build, so
+    putting it under $TMPDIR (node-local on most clusters) keeps two full
+    passes over the archive off the shared filesystem. If packing there
+    fails — typically because the local disk is too small — retry in
+    fallback_dir.
+    """
+    staging_dir = Path(tempfile.mkdtemp(prefix="euler-files-"))
+    tar_path = staging_dir / f"{venv_name}.tar"
+    try:
+        _create_tarball(venv_path, tar_path)
+        return tar_path
+    except RuntimeError as e:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        _err(f"  [TAR] Packing in {staging_dir.parent} failed ({e}); retrying in {fallback_dir}")
+
+    tar_path = fallback_dir / f"{venv_name}.tar"
+    _create_tarball(venv_path, tar_path)
+    return tar_path
+
+
+def _install_sif(built: Path, sif_path: Path) -> None:
+    """Move a freshly built image into place, replacing any existing one.
+
+    The image is copied next to its destination first and then renamed
+    over it, so jobs already running the old .sif keep their (unlinked)
+    copy and nothing ever sees a partially written image.
+    """
+    try:
+        os.replace(built, sif_path)  # same filesystem: a plain rename
+        return
+    except OSError:
+        pass
+
+    tmp_path = sif_path.with_name(f".{sif_path.name}.tmp")
+    try:
+        shutil.copyfile(built, tmp_path)
+        os.replace(tmp_path, sif_path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
 def _create_tarball(venv_path: Path, tar_path: Path) -> None:
     """Create a tarball from a venv directory.
 
@@ -161,9 +268,17 @@ def _create_tarball(venv_path: Path, tar_path: Path) -> None:
     on shared filesystems.
     """
     # tar -cf output.tar -C /parent/dir venv_name
-    # This puts venv_name/ at the top level of the archive
+    # This puts venv_name/ at the top level of the archive.
+    # --owner/--group/--numeric-owner store root ownership without resolving
+    # each file's uid/gid to a name (an NSS/LDAP lookup on most clusters), and
+    # a 512-block record (256 KiB) keeps writes to the shared FS large.
+    # The archive is left uncompressed: the slim base images don't ship zstd,
+    # and the tarball is transient — it's consumed once by apptainer build.
     cmd = [
         "tar", "cf", str(tar_path),
+        "--format=pax",
+        "--blocking-factor=512",
+        "--owner=0", "--group=0", "--numeric-owner",
         "-C", str(venv_path.parent),
         venv_path.name,
     ]
@@ -179,62 +294,24 @@ def _create_tarball(venv_path: Path, tar_path: Path) -> None:
         )
 
 
-def _file_size_display(path: Path) -> str:
-    """Get human-readable file size."""
-    try:
-        size = path.stat().st_size
-        for unit in ("B", "KB", "MB", "GB", "TB"):
-            if size < 1024:
-                return f"{size:.1f} {unit}"
-            size /= 1024
-    except OSError:
-        pass
-    return "?"
-
-
-def _interactive_select(venv_base: Path, apt) -> Optional[str]:
+def _interactive_select(venv_base: Path, apt) -> Optional[VenvInfo]:
     """Interactively select a venv to build."""
     venvs = list_venvs(venv_base)
     if not venvs:
         _err(f"No venvs found in {venv_base}")
         return None
 
-    console.print()
-    table = Table(title="Available Venvs", border_style="blue")
-    table.add_column("#", style="dim", justify="right")
-    table.add_column("Name", style="bold")
-    table.add_column("Python")
-    table.add_column("Built?")
-
-    for i, venv in enumerate(venvs, 1):
+    rows = []
+    for venv in venvs:
         built = "[green]yes[/green]" if venv.name in apt.images else "[dim]no[/dim]"
-        table.add_row(str(i), venv.name, venv.python_version, built)
-
-    console.print(table)
-    console.print()
-
-    choice = Prompt.ask(
-        "Select a venv (number or name)",
-        console=console,
+        rows.append((venv.python_version, built))
+
+    idx = _interactive_pick(
+        title="Available Venvs",
+        names=[venv.name for venv in venvs],
+        columns=["Python", "Built?"],
+        rows=rows,
+        prompt="Select a venv (number or name)",
+        noun="venv",
     )
-
-    # Try as number first
-    try:
-        idx = int(choice) - 1
-        if 0 <= idx < len(venvs):
-            return venvs[idx].name
-    except ValueError:
-        pass
-
-    # Try as name
-    for venv in venvs:
-        if venv.name == choice:
-            return venv.name
-
-    _err(f"Unknown venv: {choice}")
-    return None
-
-
-def _err(msg: str) -> None:
-    """Print to stderr."""
-    print(msg, file=sys.stderr)
+    return None if idx is None else venvs[idx]
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
+
 # Tarball-based template: copies a single .tar file instead of the directory
 # tree. This is dramatically faster on shared HPC filesystems (GPFS/Lustre)
 # because tar reads sequentially (one open, one stream) while %files on a
@@ -29,31 +31,62 @@ From: {base_image}
     tar xf /opt/venv.tar -C "$CONTAINER_VENV" --strip-components=1
     rm -f /opt/venv.tar
 
-    # Fix pyvenv.cfg to point to the container's system Python
-    PYVENV_CFG="$CONTAINER_VENV/pyvenv.cfg"
-    if [ -f "$PYVENV_CFG" ]; then
-        PYTHON_BIN=$(dirname $(which python$PYTHON_MM 2>/dev/null || which python3))
-        sed -i "s|^home = .*|home = $PYTHON_BIN|" "$PYVENV_CFG"
-    fi
+    # Point the venv at the container's Python. pyvenv.cfg, the bin/ shebangs
+    # and bin/activate are fixed up in a single Python pass that reads each
+    # file once and only writes back files whose content actually changed —
+    # one open per script instead of an in-place sed rewrite per file.
+    SYSTEM_PYTHON=$(which python$PYTHON_MM 2>/dev/null || which python3)
+    export CONTAINER_VENV SYSTEM_PYTHON
+    "$SYSTEM_PYTHON" - <<'PY'
+import os
+import re
+
+venv = os.environ["CONTAINER_VENV"]
+system_python = os.environ["SYSTEM_PYTHON"]
+
+shebang = ("#!" + venv + "/bin/python").encode()
+home_line = ("home = " + os.path.dirname(system_python)).encode()
+activate_line = ('VIRTUAL_ENV="' + venv + '"').encode()
+
+SHEBANG_RE = re.compile(rb"^#!.*/python[0-9.]*")
+HOME_RE = re.compile(rb"^home = .*$", re.MULTILINE)
+ACTIVATE_RE = re.compile(rb"VIRTUAL_ENV=.*")
+
+
+def rewrite(path, transform):
+    with open(path, "rb") as f:
+        old = f.read()
+    new = transform(old)
+    if new != old:
+        with open(path, "wb") as f:
+            f.write(new)
 
-    # Fix shebangs in venv bin/ scripts
-    VENV_BIN="$CONTAINER_VENV/bin"
-    if [ -d "$VENV_BIN" ]; then
-        find "$VENV_BIN" -type f -exec \\
-            sed -i "1s|^#!.*/python[0-9.]*|#!$CONTAINER_VENV/bin/python|" {{}} +
-    fi
+
+cfg = os.path.join(venv, "pyvenv.cfg")
+if os.path.isfile(cfg):
+    rewrite(cfg, lambda data: HOME_RE.sub(lambda m: home_line, data))
+
+bin_dir = os.path.join(venv, "bin")
+if os.path.isdir(bin_dir):
+    for entry in os.scandir(bin_dir):
+        if not entry.is_file(follow_symlinks=False):
+            continue
+        is_activate = entry.name == "activate"
+
+        def fix(data):
+            data = SHEBANG_RE.sub(lambda m: shebang, data, count=1)
+            if is_activate:
+                data = ACTIVATE_RE.sub(lambda m: activate_line, data)
+            return data
+
+        rewrite(entry.path, fix)
+PY
 
     # Ensure python symlinks point to the container's Python
-    SYSTEM_PYTHON=$(which python$PYTHON_MM 2>/dev/null || which python3)
     rm -f "$CONTAINER_VENV/bin/python" "$CONTAINER_VENV/bin/python3"
     ln -sf "$SYSTEM_PYTHON" "$CONTAINER_VENV/bin/python"
     ln -sf "$SYSTEM_PYTHON" "$CONTAINER_VENV/bin/python3"
 
-    # Fix activate script VIRTUAL_ENV path
-    if [ -f "$CONTAINER_VENV/bin/activate" ]; then
-        sed -i "s|VIRTUAL_ENV=.*|VIRTUAL_ENV=\\"$CONTAINER_VENV\\"|" "$CONTAINER_VENV/bin/activate"
-    fi
-
 %environment
     export VIRTUAL_ENV="{container_venv_path}"
     export PATH="{container_venv_path}/bin:$PATH"
@@ -63,6 +96,7 @@ From: {base_image}
 """
 
 
+@lru_cache(maxsize=32)
 def generate_def_file(
     venv_name: str,
     tar_path: str,
@@ -7,13 +7,27 @@ rewrites them to match the venv's actual location on disk.
 
 from __future__ import annotations
 
+import os
 import re
-import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Optional
 
+from euler_files.apptainer._util import _err
 from euler_files.apptainer.venv import list_venvs
 
+# Shebang lines are short (the kernel only honours the first 256 bytes) and
+# VIRTUAL_ENV is assigned near the top of activate, so files are read in
+# small blocks and usually only the first one is needed.
+_READ_BLOCK_SIZE = 4096
+
+# Match: VIRTUAL_ENV="/some/path" or VIRTUAL_ENV='/some/path' or VIRTUAL_ENV=/some/path.
+# Skips the Cygwin branch of newer stdlib activate scripts, which assigns
+# VIRTUAL_ENV=$(cygpath ...) before the plain assignment.
+# Matched against raw bytes, so activate is never decoded and non-UTF-8
+# paths survive (os.fsdecode/fsencode round-trip them).
+_VIRTUAL_ENV_RE = re.compile(rb'VIRTUAL_ENV=(?!\$\()["\']?([^"\';\n]+)["\']?')
+
 
 def fixup_venv(venv_path: Path, dry_run: bool = False) -> int:
     """Fix internal paths in a single venv to match its actual location.
@@ -38,35 +52,38 @@ def fixup_venv(venv_path: Path, dry_run: bool = False) -> int:
 
     fixed = 0
 
+    old_bytes = os.fsencode(old_path)
+    new_bytes = os.fsencode(actual_path)
+
     # Fix bin/activate — replace all occurrences of old path
     try:
-        text = activate.read_text()
-        new_text = text.replace(old_path, actual_path)
-        if new_text != text:
+        data = activate.read_bytes()
+        new_data = data.replace(old_bytes, new_bytes)
+        if new_data != data:
             if not dry_run:
-                activate.write_text(new_text)
+                activate.write_bytes(new_data)
             fixed += 1
     except OSError:
         pass
 
-    # Fix shebangs in all other bin/ scripts
-    if bin_dir.is_dir():
-        for script in sorted(bin_dir.iterdir()):
-            if not script.is_file() or script.name == "activate":
-                continue
-            try:
-                raw = script.read_bytes()
-                if not raw.startswith(b"#!"):
-                    continue
-                text = raw.decode("utf-8", errors="replace")
-                first_line, _, rest = text.partition("\n")
-                new_first = first_line.replace(old_path, actual_path)
-                if new_first != first_line:
-                    if not dry_run:
-                        script.write_text(new_first + "\n" + rest)
-                    fixed += 1
-            except OSError:
-                pass
+    # Fix shebangs in all other bin/ scripts. scandir's DirEntry answers
+    # is_file() from the directory listing, and only the first block of each
+    # script is read unless its shebang actually references the old path.
+    # Symlinks (bin/python -> system interpreter) are never followed.
+    try:
+        with os.scandir(bin_dir) as it:
+            entries = sorted(it, key=lambda e: e.name)
+    except OSError:
+        entries = []
+
+    for entry in entries:
+        if entry.name == "activate" or not entry.is_file(follow_symlinks=False):
+            continue
+        try:
+            if _rewrite_shebang(entry.path, old_bytes, new_bytes, dry_run):
+                fixed += 1
+        except OSError:
+            pass
 
     return fixed
 
@@ -76,8 +93,12 @@ def run_fixup(
     dry_run: bool = False,
     config_path: Optional[Path] = None,
 ) -> None:
-    """Fix venv paths for one or all venvs under venv_base."""
-    import os
+    """Fix venv paths for one or all venvs under venv_base.
+
+    When fixing all venvs, they are processed concurrently (up to the
+    config's parallel_jobs) — the work is bound by filesystem latency,
+    not CPU, so overlapping it hides most of the per-op round trips.
+    """
     from euler_files.config import load_config
 
     config = load_config(config_path)
@@ -88,7 +109,7 @@ def run_fixup(
         )
 
     apt = config.apptainer
-    venv_base = Path(os.path.expandvars(os.path.expanduser(apt.venv_base)))
+    venv_base = apt.venv_base_path()
 
     if not venv_base.is_dir():
         raise FileNotFoundError(f"Venv base directory does not exist: {venv_base}")
@@ -106,11 +127,15 @@ def run_fixup(
             _err(f"  {venv_name}: paths already correct, nothing to fix")
     else:
         # Fix all venvs
+        children = [
+            child for child in sorted(venv_base.iterdir())
+            if child.is_dir() and (child / "pyvenv.cfg").exists()
+        ]
+        with ThreadPoolExecutor(max_workers=config.parallel_jobs) as pool:
+            results = list(pool.map(lambda c: fixup_venv(c, dry_run=dry_run), children))
+
         total = 0
-        for child in sorted(venv_base.iterdir()):
-            if not child.is_dir() or not (child / "pyvenv.cfg").exists():
-                continue
-            fixed = fixup_venv(child, dry_run=dry_run)
+        for child, fixed in zip(children, results):
             if fixed:
                 prefix = "[DRY-RUN] " if dry_run else ""
                 _err(f"  {prefix}[FIXUP] {child.name}: {'would rewrite' if dry_run else 'rewrote'} {fixed} file(s)")
@@ -122,20 +147,56 @@ def run_fixup(
             _err(f"\n  Fixed {total} file(s) total.")
 
 
+def _rewrite_shebang(path: str, old: bytes, new: bytes, dry_run: bool) -> bool:
+    """Replace old with new in a script's shebang line.
+
+    Returns True if the shebang references old (i.e. the file was, or in
+    dry-run mode would be, rewritten). The script body is kept byte-for-byte.
+    When old and new have the same length, only the first line is
+    overwritten in place; otherwise the whole file is rewritten.
+    """
+    with open(path, "rb", buffering=0) as f:
+        head = f.read(_READ_BLOCK_SIZE)
+        if not head.startswith(b"#!"):
+            return False
+        first_line = head.partition(b"\n")[0]
+        if old not in first_line:
+            return False
+        if dry_run:
+            return True
+        new_first = first_line.replace(old, new)
+        if len(new_first) == len(first_line):
+            data = None
+        else:
+            data = head + f.read()
+
+    if data is None:
+        with open(path, "r+b", buffering=0) as f:
+            f.write(new_first)
+    else:
+        with open(path, "wb") as f:
+            f.write(new_first + data[len(first_line):])
+    return True
+
+
 def _detect_old_path(activate_path: Path) -> Optional[str]:
-    """Extract the VIRTUAL_ENV value from an activate script."""
+    """Extract the VIRTUAL_ENV value from an activate script.
+
+    Reads in chunks and stops at the first complete match, which is near
+    the top of every activate script.
+    """
     try:
-        text = activate_path.read_text()
+        with activate_path.open("rb") as f:
+            data = b""
+            while True:
+                chunk = f.read(_READ_BLOCK_SIZE)
+                data += chunk
+                match = _VIRTUAL_ENV_RE.search(data)
+                # A match running up to the end of the buffer may be a line
+                # cut off mid-path; keep reading unless we're at EOF.
+                if match and (match.end() < len(data) or not chunk):
+                    return os.fsdecode(match.group(1).rstrip())
+                if not chunk:
+                    return None
     except OSError:
         return None
-
-    # Match: VIRTUAL_ENV="/some/path" or VIRTUAL_ENV='/some/path' or VIRTUAL_ENV=/some/path
-    match = re.search(r'VIRTUAL_ENV=["\']?([^"\';\n]+)["\']?', text)
-    if match:
-        return match.group(1).rstrip()
-    return None
-
-
-def _err(msg: str) -> None:
-    """Print to stderr."""
-    print(msg, file=sys.stderr)
@@ -4,18 +4,21 @@ from __future__ import annotations
 
 import os
 import shutil
+import stat
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
-
-from rich.console import Console
-from rich.prompt import Confirm, Prompt
-from rich.table import Table
+from typing import List, Optional, Set
 
 from euler_files.config import load_config, save_config
+from euler_files.apptainer._util import _console, _err, _interactive_pick, _which
+from euler_files.fsutil import dir_size_display, format_size
+
 
-console = Console(stderr=True)
+# How many directory levels _parallel_rmtree expands looking for subtrees
+# to delete concurrently (venv/lib/pythonX.Y/site-packages/<pkg> is 4 deep).
+_RMTREE_EXPAND_DEPTH = 4
 
 
 class PruneMode:
@@ -40,7 +43,7 @@ def run_prune(
         )
 
     apt = config.apptainer
-    venv_base = Path(os.path.expandvars(os.path.expanduser(apt.venv_base)))
+    venv_base = apt.venv_base_path()
     sif_store = apt.sif_store_path()
     scratch_sif = apt.scratch_sif_path()
 
@@ -62,42 +65,44 @@ def run_prune(
     def_path = sif_store / f"{image_name}.def"
     scratch_sif_file = scratch_sif / f"{image_name}.sif"
 
-    # Show what will be deleted
-    targets: List[tuple[str, Path, str]] = []
+    # Show what will be deleted. Each candidate is stat'ed exactly once; the
+    # result supplies existence, the file size and whether deletion needs
+    # rmtree or unlink.
+    targets: List[tuple[str, Path, str, bool]] = []
 
     if mode in (PruneMode.BOTH, PruneMode.VENV_ONLY):
-        if venv_path.exists():
-            size = _get_size_display(venv_path)
-            targets.append(("venv", venv_path, size))
+        st = _stat(venv_path)
+        if st is not None:
+            is_dir = stat.S_ISDIR(st.st_mode)
+            size = dir_size_display(venv_path) if is_dir else format_size(st.st_size)
+            targets.append(("venv", venv_path, size, is_dir))
         else:
             _err(f"  [SKIP] Venv not found: {venv_path}")
 
     if mode in (PruneMode.BOTH, PruneMode.SIF_ONLY):
-        if sif_path.exists():
-            size = _file_size_display(sif_path)
-            targets.append(("sif", sif_path, size))
-        else:
-            _err(f"  [SKIP] SIF not found: {sif_path}")
-
-        if def_path.exists():
-            targets.append(("def", def_path, _file_size_display(def_path)))
-
-        if scratch_sif_file.exists():
-            size = _file_size_display(scratch_sif_file)
-            targets.append(("scratch sif", scratch_sif_file, size))
+        for kind, path in (("sif", sif_path), ("def", def_path), ("scratch sif", scratch_sif_file)):
+            st = _stat(path)
+            if st is not None:
+                is_dir = stat.S_ISDIR(st.st_mode)
+                targets.append((kind, path, format_size(st.st_size), is_dir))
+            elif kind == "sif":
+                _err(f"  [SKIP] SIF not found: {sif_path}")
 
     if not targets:
         _err("Nothing to prune.")
         return
 
     # Display summary
+    from rich.table import Table
+
+    console = _console()
     console.print()
     table = Table(title=f"Prune '{image_name}'", border_style="red")
     table.add_column("Type", style="bold")
     table.add_column("Path")
     table.add_column("Size", justify="right")
 
-    for kind, path, size in targets:
+    for kind, path, size, _ in targets:
         table.add_row(kind, str(path), size)
 
     console.print(table)
@@ -109,6 +114,8 @@ def run_prune(
 
     # Confirm
     if not yes:
+        from rich.prompt import Confirm
+
         if not Confirm.ask(
             "[red]Delete these files?[/red] This cannot be undone",
             default=False,
@@ -118,14 +125,13 @@ def run_prune(
             return
 
     # Execute deletions
-    for kind, path, size in targets:
+    for kind, path, _, is_dir in targets:
         try:
-            if path.is_dir():
-                shutil.rmtree(path)
-                _err(f"  [DELETED] {kind}: {path}")
-            elif path.is_file():
+            if is_dir:
+                _parallel_rmtree(path, workers=config.parallel_jobs)
+            else:
                 path.unlink()
-                _err(f"  [DELETED] {kind}: {path}")
+            _err(f"  [DELETED] {kind}: {path}")
         except OSError as exc:
             _err(f"  [ERROR] Failed to delete {path}: {exc}")
 
@@ -142,62 +148,54 @@ def run_prune(
 
 def _interactive_select(apt, venv_base: Path, sif_store: Path) -> Optional[str]:
     """Show available images/venvs and let user pick one."""
-    # Collect all known names: from config + from filesystem
+    # Collect all known names: from config + from filesystem. One listing of
+    # each directory answers every existence check below.
     known: dict[str, dict[str, str]] = {}
+    venv_dirs = _list_names(venv_base, dirs=True)
+    sif_files = _list_names(sif_store, dirs=False)
 
     # From config
     for name, img in apt.images.items():
         known[name] = {
-            "sif": "yes" if (sif_store / img.sif_filename).exists() else "missing",
-            "venv": "yes" if (venv_base / name).exists() else "missing",
+            "sif": "yes" if img.sif_filename in sif_files else "missing",
+            "venv": "yes" if name in venv_dirs else "missing",
         }
 
     # From filesystem (venvs not in config)
-    if venv_base.is_dir():
-        for child in sorted(venv_base.iterdir()):
-            if child.is_dir() and (child / "pyvenv.cfg").exists():
-                if child.name not in known:
-                    sif_exists = (sif_store / f"{child.name}.sif").exists()
-                    known[child.name] = {
-                        "sif": "yes" if sif_exists else "no",
-                        "venv": "yes",
-                    }
+    for name in sorted(venv_dirs - known.keys()):
+        if (venv_base / name / "pyvenv.cfg").exists():
+            known[name] = {
+                "sif": "yes" if f"{name}.sif" in sif_files else "no",
+                "venv": "yes",
+            }
 
     if not known:
         _err("No images or venvs found to prune.")
         return None
 
-    console.print()
-    table = Table(title="Available for Pruning", border_style="red")
-    table.add_column("#", style="dim", justify="right")
-    table.add_column("Name", style="bold")
-    table.add_column("Venv")
-    table.add_column("SIF")
+    def _mark(value: str) -> str:
+        return f"[green]{value}[/green]" if value == "yes" else f"[dim]{value}[/dim]"
 
     names = sorted(known.keys())
-    for i, name in enumerate(names, 1):
-        info = known[name]
-        venv_str = f"[green]{info['venv']}[/green]" if info["venv"] == "yes" else f"[dim]{info['venv']}[/dim]"
-        sif_str = f"[green]{info['sif']}[/green]" if info["sif"] == "yes" else f"[dim]{info['sif']}[/dim]"
-        table.add_row(str(i), name, venv_str, sif_str)
-
-    console.print(table)
-    console.print()
+    idx = _interactive_pick(
+        title="Available for Pruning",
+        names=names,
+        columns=["Venv", "SIF"],
+        rows=[(_mark(known[name]["venv"]), _mark(known[name]["sif"])) for name in names],
+        prompt="Select an environment to prune (number or name)",
+        noun="environment",
+        border_style="red",
+    )
+    return None if idx is None else names[idx]
 
-    choice = Prompt.ask("Select an environment to prune (number or name)", console=console)
 
+def _list_names(directory: Path, dirs: bool) -> Set[str]:
+    """Names of the subdirectories (dirs=True) or files in a directory."""
     try:
-        idx = int(choice) - 1
-        if 0 <= idx < len(names):
-            return names[idx]
-    except ValueError:
-        pass
-
-    if choice in known:
-        return choice
-
-    _err(f"Unknown environment: {choice}")
-    return None
+        with os.scandir(directory) as it:
+            return {e.name for e in it if (e.is_dir() if dirs else e.is_file())}
+    except OSError:
+        return set()
 
 
 def _interactive_mode(image_name: str, venv_base: Path, sif_store: Path) -> Optional[str]:
@@ -219,6 +217,9 @@ def _interactive_mode(image_name: str, venv_base: Path, sif_store: Path) -> Opti
         _err(f"Nothing found for '{image_name}'.")
         return None
 
+    from rich.prompt import Prompt
+
+    console = _console()
     console.print()
     console.print(f"[bold]What to remove for '{image_name}'?[/bold]")
     for i, (mode, label, desc) in enumerate(options, 1):
@@ -246,35 +247,96 @@ def _interactive_mode(image_name: str, venv_base: Path, sif_store: Path) -> Opti
     return None
 
 
-def _get_size_display(path: Path) -> str:
-    """Get human-readable size of a directory."""
-    try:
-        result = subprocess.run(
-            ["du", "-sh", str(path)],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-        if result.returncode == 0:
-            return result.stdout.split()[0]
-    except (subprocess.TimeoutExpired, FileNotFoundError, IndexError):
-        pass
-    return "?"
+def _parallel_rmtree(path: Path, workers: int = 4) -> None:
+    """Delete a directory tree, unlinking independent subtrees concurrently.
 
+    Deleting a venv is one unlink per file, and on a shared filesystem each
+    of those is a metadata-server round trip, so overlapping them matters
+    more than CPU. The tree is expanded breadth-first (a few levels, until
+    there are enough subtrees to keep the pool busy — in a venv the bulk
+    sits in lib/pythonX.Y/site-packages/*), the subtrees are removed in
+    parallel, and the expanded directories are then removed bottom-up.
+    Anything that goes wrong falls back to a serial rmtree, which also
+    makes read-only directories writable before retrying.
 
-def _file_size_display(path: Path) -> str:
-    """Get human-readable file size."""
+    A symlink at ``path`` is unlinked, never descended into.
+    """
+    if os.path.islink(path):
+        os.unlink(path)
+        return
+
+    files: List[str] = []
+    expanded: List[str] = []
+    level = [str(path)]
     try:
-        size = path.stat().st_size
-        for unit in ("B", "KB", "MB", "GB", "TB"):
-            if size < 1024:
-                return f"{size:.1f} {unit}"
-            size /= 1024
+        for _ in range(_RMTREE_EXPAND_DEPTH):
+            if len(level) >= workers * 4:
+                break
+            next_level: List[str] = []
+            for directory in level:
+                expanded.append(directory)
+                with os.scandir(directory) as it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            next_level.append(entry.path)
+                        else:
+                            files.append(entry.path)
+            level = next_level
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(os.unlink, files))
+            list(pool.map(_rmtree, level))
+        for directory in reversed(expanded):
+            os.rmdir(directory)
     except OSError:
-        pass
-    return "?"
+        if os.path.lexists(path):
+            _rmtree(str(path))
+
+
+def _rmtree(path: str) -> None:
+    """Delete a directory tree, preferring the system rm.
+
+    ``rm -rf`` runs the readdir/unlink loop in C, which is much faster than
+    shutil.rmtree's per-entry Python on trees like torch's site-packages.
+    If rm is missing or leaves something behind (typically entries inside
+    a read-only directory), finish with shutil.rmtree, which makes such
+    directories writable and retries.
+    """
+    rm = _which("rm")
+    if rm is not None:
+        subprocess.run(
+            [rm, "-rf", "--", path],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        if not os.path.lexists(path):
+            return
+    if sys.version_info >= (3, 12):
+        shutil.rmtree(path, onexc=_rmtree_retry_writable)
+    else:
+        shutil.rmtree(path, onerror=_rmtree_retry_writable)
+
+
+def _rmtree_retry_writable(func, path: str, _exc) -> None:
+    """rmtree error handler: chmod u+rwx the containing directory and retry.
+
+    Some package installs leave read-only directories behind, which makes
+    unlinking their entries fail. Symlinks are never chmod'ed, so nothing
+    outside the tree being deleted is touched.
+    """
+    for target in (os.path.dirname(path), path):
+        if os.path.isdir(target) and not os.path.islink(target):
+            os.chmod(target, stat.S_IRWXU)
+    func(path)
 
 
-def _err(msg: str) -> None:
-    """Print to stderr."""
-    print(msg, file=sys.stderr)
+def _stat(path: Path) -> Optional[os.stat_result]:
+    """lstat() a path, returning None if it doesn't exist or can't be read.
+
+    Symlinks are not followed: a symlinked venv is reported as a link, so
+    pruning removes the link and never the directory it points to.
+    """
+    try:
+        return os.stat(path, follow_symlinks=False)
+    except OSError:
+        return None
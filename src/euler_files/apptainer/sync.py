@@ -4,12 +4,17 @@ from __future__ import annotations
 
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import List, Optional
 
 from euler_files.config import load_config
 from euler_files.lock import acquire_lock
 from euler_files.rsync import rsync_file
+from euler_files.apptainer._util import _err
+
+# Tolerance for mtime comparison, like rsync's --modify-window.
+_MTIME_WINDOW = 1.0
 
 
 def run_apptainer_sync(
@@ -30,12 +35,16 @@ def run_apptainer_sync(
     sif_store = apt.sif_store_path()
     scratch_dir = apt.scratch_sif_path()
 
-    # Filter images
-    images = {
-        name: img
-        for name, img in apt.images.items()
-        if img.enabled and (only_images is None or name in only_images)
-    }
+    # Filter images. When names are given, look just those up instead of
+    # testing every configured image against the list.
+    if only_images is None:
+        images = {name: img for name, img in apt.images.items() if img.enabled}
+    else:
+        images = {}
+        for name in only_images:
+            img = apt.images.get(name)
+            if img is not None and img.enabled:
+                images[name] = img
 
     if not images:
         _err("No apptainer images to sync.")
@@ -44,40 +53,35 @@ def run_apptainer_sync(
     _err(f"euler-files: syncing {len(images)} apptainer image(s)")
     _err("")
 
-    scratch_dir_expanded = Path(os.path.expandvars(str(scratch_dir)))
-    scratch_dir_expanded.mkdir(parents=True, exist_ok=True)
+    scratch_dir.mkdir(parents=True, exist_ok=True)
 
     errors: List[str] = []
 
-    for name, img in images.items():
-        source = sif_store / img.sif_filename
-        target = scratch_dir_expanded / img.sif_filename
-
-        if not source.exists():
-            _err(f"  [WARN] {name}: {source} does not exist, skipping")
-            continue
-
-        # Smart skip: compare mtimes
-        if not force and target.exists():
-            source_mtime = source.stat().st_mtime
-            target_mtime = target.stat().st_mtime
-            if target_mtime >= source_mtime:
-                _err(f"  [SKIP] {name}: already up-to-date")
-                continue
-
-        if dry_run:
-            _err(f"  [DRY-RUN] {name}: would sync {source} -> {target}")
-            continue
-
-        # Acquire per-image lock
-        lock_path = scratch_dir_expanded / f".{name}.sif.lock"
-        try:
-            with acquire_lock(lock_path, timeout=config.lock_timeout_seconds):
-                _err(f"  [SYNC] {name}: {source} -> {target}")
-                rsync_file(source=source, target=target)
-        except Exception as exc:
-            errors.append(f"{name}: {exc}")
-            _err(f"  [ERROR] Failed to sync {name}: {exc}")
+    # Images are independent and each one is bound by filesystem latency,
+    # so sync them concurrently like run_sync does for cache variables.
+    # The per-image lock still serialises concurrent euler-files processes.
+    with ThreadPoolExecutor(max_workers=config.parallel_jobs) as pool:
+        futures = {
+            pool.submit(
+                _sync_one_image,
+                name,
+                img.sif_filename,
+                sif_store,
+                scratch_dir,
+                dry_run,
+                force,
+                config.lock_timeout_seconds,
+            ): name
+            for name, img in images.items()
+        }
+
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                future.result()
+            except Exception as exc:
+                errors.append(f"{name}: {exc}")
+                _err(f"  [ERROR] Failed to sync {name}: {exc}")
 
     _err("")
     if errors:
@@ -87,6 +91,56 @@ def run_apptainer_sync(
         _err("Done. All images synced successfully.")
 
 
-def _err(msg: str) -> None:
-    """Print to stderr."""
-    print(msg, file=sys.stderr)
+def _sync_one_image(
+    name: str,
+    sif_filename: str,
+    sif_store: Path,
+    scratch_dir: Path,
+    dry_run: bool,
+    force: bool,
+    lock_timeout: int,
+) -> None:
+    """Sync a single .sif image to scratch. Raises on failure."""
+    source = sif_store / sif_filename
+    target = scratch_dir / sif_filename
+
+    # One stat per side: existence and mtime come from the same call
+    try:
+        source_st = os.stat(source)
+    except FileNotFoundError:
+        _err(f"  [WARN] {name}: {source} does not exist, skipping")
+        return
+
+    # Smart skip: compare size and mtime
+    if not force:
+        try:
+            target_st = os.stat(target)
+        except FileNotFoundError:
+            target_st = None
+        if target_st is not None and _is_up_to_date(source_st, target_st):
+            _err(f"  [SKIP] {name}: already up-to-date")
+            return
+
+    if dry_run:
+        _err(f"  [DRY-RUN] {name}: would sync {source} -> {target}")
+        return
+
+    # Acquire per-image lock
+    lock_path = scratch_dir / f".{name}.sif.lock"
+    with acquire_lock(lock_path, timeout=lock_timeout):
+        _err(f"  [SYNC] {name}: {source} -> {target}")
+        rsync_file(source=source, target=target)
+
+
+def _is_up_to_date(source_st: os.stat_result, target_st: os.stat_result) -> bool:
+    """Whether the scratch copy matches the source image.
+
+    Sizes must match, and the target must not be older than the source by
+    more than _MTIME_WINDOW — filesystems that store coarser timestamps
+    round the mtime rsync -a copies over, which would otherwise make every
+    run resync an unchanged image.
+    """
+    return (
+        target_st.st_size == source_st.st_size
+        and target_st.st_mtime + _MTIME_WINDOW > source_st.st_mtime
+    )
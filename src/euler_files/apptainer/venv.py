@@ -2,15 +2,30 @@
 
 from __future__ import annotations
 
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
+# One 'key = value' line of pyvenv.cfg. Blank lines, comments and lines
+# without '=' don't match; surrounding whitespace (and a CR from CRLF
+# files) is left out of both groups.
+_CFG_LINE_RE = re.compile(
+    rb"^[ \t]*([^#=\s][^=\n]*?)[ \t]*=[ \t]*([^\n]*?)[ \t\r]*$", re.MULTILINE
+)
 
-@dataclass
+
+@dataclass(frozen=True)
 class VenvInfo:
     """Information about a discovered Python venv."""
 
+    # Spelled out rather than dataclass(slots=True), which needs Python 3.10.
+    __slots__ = ("name", "path", "python_version", "python_major_minor")
+
     name: str
     path: Path
     python_version: str  # Full version like "3.11.5"
@@ -20,21 +35,31 @@ class VenvInfo:
 def parse_pyvenv_cfg(venv_path: Path) -> Dict[str, str]:
     """Parse pyvenv.cfg into a dict of key-value pairs.
 
-    Format: 'key = value' per line.
+    Format: 'key = value' per line. Parsed results are cached keyed on the
+    file's mtime and size, so listing the same venvs again (the wizard
+    and build pickers do) doesn't re-read unchanged files.
     """
     cfg_path = venv_path / "pyvenv.cfg"
-    if not cfg_path.exists():
+    try:
+        st = cfg_path.stat()
+    except FileNotFoundError:
         raise ValueError(f"No pyvenv.cfg found at {cfg_path}")
 
-    result: Dict[str, str] = {}
-    for line in cfg_path.read_text().splitlines():
-        line = line.strip()
-        if not line or line.startswith("#"):
-            continue
-        if "=" in line:
-            key, _, value = line.partition("=")
-            result[key.strip()] = value.strip()
-    return result
+    return dict(_parse_pyvenv_cfg_cached(str(cfg_path), st.st_mtime_ns, st.st_size))
+
+
+@lru_cache(maxsize=256)
+def _parse_pyvenv_cfg_cached(cfg_path: str, mtime_ns: int, size: int) -> Dict[str, str]:
+    """Read and parse a pyvenv.cfg. mtime_ns and size only key the cache.
+
+    Parsed as bytes with one regex scan; only the keys and values are
+    decoded (with the filesystem encoding, since values are mostly paths).
+    """
+    data = Path(cfg_path).read_bytes()
+    return {
+        os.fsdecode(key): os.fsdecode(value)
+        for key, value in _CFG_LINE_RE.findall(data)
+    }
 
 
 def detect_python_version(venv_path: Path) -> str:
@@ -80,27 +105,37 @@ def list_venvs(venv_base: Path) -> List[VenvInfo]:
 
     Looks for immediate subdirectories containing pyvenv.cfg.
     """
-    if not venv_base.is_dir():
+    # One directory listing; DirEntry.is_dir() is answered from the readdir
+    # data for everything but symlinks (which are followed, so symlinked
+    # venvs are still found). A missing base directory or pyvenv.cfg surfaces
+    # as an exception instead of separate is_dir()/exists() checks.
+    try:
+        it = os.scandir(venv_base)
+    except (FileNotFoundError, NotADirectoryError):
         return []
+    with it:
+        entries = sorted((e for e in it if e.is_dir()), key=lambda e: e.name)
 
-    venvs: List[VenvInfo] = []
-    for child in sorted(venv_base.iterdir()):
-        if not child.is_dir():
-            continue
-        cfg_path = child / "pyvenv.cfg"
-        if not cfg_path.exists():
-            continue
-
-        try:
-            version = detect_python_version(child)
-            major_minor = ".".join(version.split(".")[:2])
-            venvs.append(VenvInfo(
-                name=child.name,
-                path=child,
-                python_version=version,
-                python_major_minor=major_minor,
-            ))
-        except ValueError:
-            continue
-
-    return venvs
+    if not entries:
+        return []
+    # Each venv costs a stat and a read of its pyvenv.cfg; on network
+    # filesystems those round trips dominate, so issue them concurrently.
+    # map() keeps the results in name order.
+    with ThreadPoolExecutor(max_workers=min(32, len(entries))) as pool:
+        infos = pool.map(_venv_info, repeat(venv_base), (e.name for e in entries))
+        return [info for info in infos if info is not None]
+
+
+def _venv_info(venv_base: Path, name: str) -> Optional[VenvInfo]:
+    """Describe one venv under venv_base, or None if it has no usable pyvenv.cfg."""
+    child = venv_base / name
+    try:
+        version = detect_python_version(child)
+    except ValueError:
+        return None
+    return VenvInfo(
+        name=name,
+        path=child,
+        python_version=version,
+        python_major_minor=".".join(version.split(".")[:2]),
+    )
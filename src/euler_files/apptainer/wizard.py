@@ -3,15 +3,10 @@
 from __future__ import annotations
 
 import os
-import shutil
-import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
-
-from rich.console import Console
-from rich.panel import Panel
-from rich.prompt import Confirm, Prompt
-from rich.table import Table
+from typing import List, Optional, Tuple
 
 from euler_files.config import (
     CONFIG_PATH,
@@ -20,13 +15,24 @@ from euler_files.config import (
     load_config,
     save_config,
 )
-from euler_files.apptainer.venv import list_venvs
+from euler_files.apptainer._util import _console, _which
+from euler_files.apptainer.venv import VenvInfo, list_venvs
+from euler_files.fsutil import dir_size_display
+
 
-console = Console(stderr=True)
+@lru_cache(maxsize=256)
+def _expand(path: str) -> str:
+    """Expand ~ and $VARS in a path (cleared at the start of each run)."""
+    return os.path.expandvars(os.path.expanduser(path))
 
 
 def run_apptainer_wizard() -> None:
     """Run the interactive apptainer setup wizard."""
+    from rich.panel import Panel
+    from rich.prompt import Confirm
+
+    console = _console()
+    _expand.cache_clear()
     console.print()
     console.print(
         Panel.fit(
@@ -55,7 +61,7 @@ def run_apptainer_wizard() -> None:
             return
 
     # Step 4: Configure venv base directory
-    venv_base = _configure_venv_base()
+    venv_base, venvs = _configure_venv_base()
 
     # Step 5: Configure SIF persistent storage
     sif_store = _configure_sif_store()
@@ -67,7 +73,7 @@ def run_apptainer_wizard() -> None:
     base_image, container_venv_path, build_args = _advanced_settings()
 
     # Step 8: Show discovered venvs
-    _show_discovered_venvs(venv_base)
+    _show_discovered_venvs(venv_base, venvs)
 
     # Step 9: Build config and show summary
     apptainer_config = ApptainerConfig(
@@ -93,6 +99,7 @@ def run_apptainer_wizard() -> None:
 
 def _load_existing_config() -> Optional[EulerFilesConfig]:
     """Load existing euler-files config. Returns None if not found."""
+    console = _console()
     try:
         return load_config()
     except FileNotFoundError:
@@ -108,7 +115,8 @@ def _load_existing_config() -> Optional[EulerFilesConfig]:
 
 def _check_apptainer() -> None:
     """Check if apptainer is available and warn if not."""
-    if shutil.which("apptainer") is None:
+    console = _console()
+    if _which("apptainer") is None:
         console.print(
             "[yellow]Warning: 'apptainer' not found in PATH.[/yellow]\n"
             "  You may need to load it first, e.g.: [green]module load apptainer[/green]\n"
@@ -116,8 +124,15 @@ def _check_apptainer() -> None:
         )
 
 
-def _configure_venv_base() -> str:
-    """Prompt for venv base directory."""
+def _configure_venv_base() -> Tuple[str, Optional[List[VenvInfo]]]:
+    """Prompt for venv base directory.
+
+    Returns the path as entered plus the venvs found in it, if they were
+    listed while validating the answer (None otherwise).
+    """
+    from rich.prompt import Confirm, Prompt
+
+    console = _console()
     console.print("[bold]Venv base directory[/bold]")
     console.print("[dim]Where your uv venvs are stored (e.g. $VENV_DIR or ~/venvs).[/dim]")
     console.print()
@@ -126,11 +141,11 @@ def _configure_venv_base() -> str:
     if venv_dir_env:
         console.print(f"  [green]$VENV_DIR[/green] = {venv_dir_env}")
         if Confirm.ask(f"Use {venv_dir_env} as venv base?", default=True, console=console):
-            return "$VENV_DIR"
+            return "$VENV_DIR", None
 
     while True:
         path = Prompt.ask("Enter venv base directory", console=console)
-        expanded = os.path.expandvars(os.path.expanduser(path))
+        expanded = _expand(path)
         if Path(expanded).is_dir():
             venvs = list_venvs(Path(expanded))
             if venvs:
@@ -139,14 +154,17 @@ def _configure_venv_base() -> str:
                 console.print("  [yellow]No venvs found in this directory.[/yellow]")
                 if not Confirm.ask("Use it anyway?", default=False, console=console):
                     continue
-            return path
+            return path, venvs
         console.print(f"  [red]Directory {expanded} does not exist.[/red]")
         if Confirm.ask("Use it anyway?", default=False, console=console):
-            return path
+            return path, None
 
 
 def _configure_sif_store() -> str:
     """Prompt for persistent SIF storage directory."""
+    from rich.prompt import Prompt
+
+    console = _console()
     console.print()
     console.print("[bold]SIF persistent storage[/bold]")
     console.print("[dim]Where built .sif files will be stored permanently.[/dim]")
@@ -154,13 +172,16 @@ def _configure_sif_store() -> str:
 
     default = str(Path.home() / ".cache" / "euler-files" / "sif")
     path = Prompt.ask("SIF storage directory", default=default, console=console)
-    expanded = os.path.expandvars(os.path.expanduser(path))
+    expanded = _expand(path)
     Path(expanded).mkdir(parents=True, exist_ok=True)
     return path
 
 
 def _configure_scratch_sif_dir(scratch_base: str) -> str:
     """Prompt for scratch SIF directory."""
+    from rich.prompt import Prompt
+
+    console = _console()
     console.print()
     console.print("[bold]Scratch SIF directory[/bold]")
     console.print("[dim]Where .sif files will be synced to on scratch for fast access.[/dim]")
@@ -173,6 +194,9 @@ def _configure_scratch_sif_dir(scratch_base: str) -> str:
 
 def _advanced_settings() -> tuple[str, str, list[str]]:
     """Prompt for advanced apptainer settings."""
+    from rich.prompt import Confirm, Prompt
+
+    console = _console()
     console.print()
     if not Confirm.ask("Configure advanced settings?", default=False, console=console):
         return "python:{version}-slim", "/opt/venv", ["--fakeroot"]
@@ -199,10 +223,13 @@ def _advanced_settings() -> tuple[str, str, list[str]]:
     return base_image, container_venv_path, build_args
 
 
-def _show_discovered_venvs(venv_base: str) -> None:
-    """Show a table of discovered venvs."""
-    expanded = Path(os.path.expandvars(os.path.expanduser(venv_base)))
-    venvs = list_venvs(expanded)
+def _show_discovered_venvs(venv_base: str, venvs: Optional[List[VenvInfo]] = None) -> None:
+    """Show a table of discovered venvs, listing venv_base unless given."""
+    from rich.table import Table
+
+    console = _console()
+    if venvs is None:
+        venvs = list_venvs(Path(_expand(venv_base)))
 
     if not venvs:
         console.print("\n[dim]No venvs found yet. Build images after creating venvs.[/dim]")
@@ -214,15 +241,20 @@ def _show_discovered_venvs(venv_base: str) -> None:
     table.add_column("Python")
     table.add_column("Size", justify="right")
 
-    for venv in venvs:
-        size = _get_size_display(venv.path)
-        table.add_row(venv.name, venv.python_version, size)
+    # Walk the venvs concurrently; each walk mostly waits on the filesystem.
+    with ThreadPoolExecutor(max_workers=min(8, len(venvs))) as pool:
+        sizes = pool.map(dir_size_display, [venv.path for venv in venvs])
+        for venv, size in zip(venvs, sizes):
+            table.add_row(venv.name, venv.python_version, size)
 
     console.print(table)
 
 
 def _show_summary(config: ApptainerConfig) -> None:
     """Display a summary of the apptainer configuration."""
+    from rich.table import Table
+
+    console = _console()
     console.print()
     table = Table(title="Apptainer Configuration", border_style="blue")
     table.add_column("Setting", style="bold")
@@ -240,6 +272,9 @@ def _show_summary(config: ApptainerConfig) -> None:
 
 def _show_next_steps() -> None:
     """Print usage instructions for apptainer commands."""
+    from rich.panel import Panel
+
+    console = _console()
     console.print()
     console.print(Panel(
         "[bold]Next steps:[/bold]\n\n"
@@ -255,19 +290,3 @@ def _show_next_steps() -> None:
         border_style="green",
         padding=(1, 2),
     ))
-
-
-def _get_size_display(path: Path) -> str:
-    """Get human-readable size of a directory."""
-    try:
-        result = subprocess.run(
-            ["du", "-sh", str(path)],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-        if result.returncode == 0:
-            return result.stdout.split()[0]
-    except (subprocess.TimeoutExpired, FileNotFoundError, IndexError):
-        pass
-    return "?"
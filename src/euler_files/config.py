@@ -4,23 +4,42 @@ from __future__ import annotations
 
 import json
 import os
+import sys
+import threading
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from euler_files.fsutil import atomic_write
 
 CONFIG_PATH = Path.home() / ".euler-files.json"
 CONFIG_VERSION = 1
 
+# dataclass(slots=True) needs Python 3.10; on older interpreters the classes
+# just keep their __dict__.
+SLOTS: Dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Parsed JSON per config path, keyed on the file's (mtime_ns, size). Only the
+# raw dict is cached; load_config builds fresh dataclasses from it every time
+# because callers modify the config they get back.
+_RAW_CACHE: Dict[Path, Tuple[int, int, Dict[str, Any]]] = {}
+_RAW_CACHE_LOCK = threading.Lock()
+
 
-@dataclass
+@dataclass(frozen=True, **SLOTS)
 class VarConfig:
     """Configuration for a single managed environment variable."""
 
     source: str  # Absolute path to persistent location
     enabled: bool = True
 
+    @classmethod
+    def from_dict(cls, d: dict) -> VarConfig:
+        """Build from the JSON form, passing fields positionally."""
+        return cls(d["source"], d.get("enabled", True))
 
-@dataclass
+
+@dataclass(frozen=True, **SLOTS)
 class ApptainerImageConfig:
     """Configuration for a single managed apptainer image."""
 
@@ -29,9 +48,22 @@ class ApptainerImageConfig:
     sif_filename: str  # e.g. "my-env.sif"
     built_at: float = 0.0  # Unix timestamp of last build
     enabled: bool = True
+    content_hash: str = ""  # fingerprint of the venv it was built from
+
+    @classmethod
+    def from_dict(cls, d: dict) -> ApptainerImageConfig:
+        """Build from the JSON form, passing fields positionally."""
+        return cls(
+            d["venv_name"],
+            d["python_version"],
+            d["sif_filename"],
+            d.get("built_at", 0.0),
+            d.get("enabled", True),
+            d.get("content_hash", ""),
+        )
 
 
-@dataclass
+@dataclass(**SLOTS)
 class ApptainerConfig:
     """Configuration for apptainer image management."""
 
@@ -43,6 +75,10 @@ class ApptainerConfig:
     build_args: List[str] = field(default_factory=lambda: ["--fakeroot"])
     images: Dict[str, ApptainerImageConfig] = field(default_factory=dict)
 
+    def venv_base_path(self) -> Path:
+        """Return the expanded venv base directory path."""
+        return Path(os.path.expandvars(os.path.expanduser(self.venv_base)))
+
     def sif_store_path(self) -> Path:
         """Return the expanded persistent sif store path."""
         return Path(os.path.expandvars(os.path.expanduser(self.sif_store)))
@@ -52,7 +88,7 @@ class ApptainerConfig:
         return Path(os.path.expandvars(os.path.expanduser(self.scratch_sif_dir)))
 
 
-@dataclass
+@dataclass(frozen=True, **SLOTS)
 class MigrationRecord:
     """Record of a single migration event."""
 
@@ -62,8 +98,15 @@ class MigrationRecord:
     field_name: str     # Config field updated: "source", "venv_base", "sif_store"
     var_name: str = ""  # For var migrations: the env var name; empty for apptainer fields
 
+    @classmethod
+    def from_dict(cls, d: dict) -> MigrationRecord:
+        """Build from the JSON form, passing fields positionally."""
+        return cls(
+            d["old_path"], d["new_path"], d["migrated_at"], d["field_name"], d.get("var_name", "")
+        )
+
 
-@dataclass
+@dataclass(**SLOTS)
 class EulerFilesConfig:
     """Top-level configuration."""
 
@@ -73,31 +116,42 @@ class EulerFilesConfig:
     vars: Dict[str, VarConfig] = field(default_factory=dict)
     rsync_extra_args: List[str] = field(default_factory=list)
     parallel_jobs: int = 4
+    intra_var_parallelism: int = 1  # concurrent rsyncs within one variable
     lock_timeout_seconds: int = 300
     skip_if_fresh_seconds: int = 3600
     apptainer: Optional[ApptainerConfig] = None
     migrations: List[MigrationRecord] = field(default_factory=list)
+    # Paths under the cache root, keyed on (scratch_base, cache_root, name)
+    # so editing either field can't serve a stale path.
+    _cache_paths: Dict[Tuple[str, str, str], Path] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
 
     def scratch_dir_for(self, var_name: str) -> Path:
         """Return the scratch target directory for a given env var."""
-        return Path(self.scratch_base) / self.cache_root / var_name
+        return self._cache_path(var_name)
 
     def marker_path_for(self, var_name: str) -> Path:
         """Return the marker file path for a given env var."""
-        return Path(self.scratch_base) / self.cache_root / f".{var_name}.synced"
+        return self._cache_path(f".{var_name}.synced")
 
     def lock_path_for(self, var_name: str) -> Path:
         """Return the lock file path for a given env var."""
-        return Path(self.scratch_base) / self.cache_root / f".{var_name}.lock"
+        return self._cache_path(f".{var_name}.lock")
+
+    def _cache_path(self, name: str) -> Path:
+        """Return scratch_base/cache_root/name, building each Path once."""
+        key = (self.scratch_base, self.cache_root, name)
+        path = self._cache_paths.get(key)
+        if path is None:
+            path = self._cache_paths[key] = Path(self.scratch_base) / self.cache_root / name
+        return path
 
 
 def load_config(path: Optional[Path] = None) -> EulerFilesConfig:
     """Load config from JSON file."""
     p = path or CONFIG_PATH
-    if not p.exists():
-        raise FileNotFoundError(f"Config not found at {p}. Run 'euler-files init' first.")
-
-    raw = json.loads(p.read_text())
+    raw = _read_raw(p)
 
     if raw.get("version", 0) != CONFIG_VERSION:
         raise ValueError(
@@ -105,7 +159,7 @@ def load_config(path: Optional[Path] = None) -> EulerFilesConfig:
             f"got {raw.get('version')}. Re-run 'euler-files init'."
         )
 
-    vars_dict = {k: VarConfig(**v) for k, v in raw.get("vars", {}).items()}
+    vars_dict = {k: VarConfig.from_dict(v) for k, v in raw.get("vars", {}).items()}
 
     # Expand $SCRATCH and other env vars in scratch_base
     scratch_base = os.path.expandvars(raw.get("scratch_base", ""))
@@ -118,7 +172,7 @@ def load_config(path: Optional[Path] = None) -> EulerFilesConfig:
     raw_apt = raw.get("apptainer")
     if raw_apt is not None:
         images = {
-            k: ApptainerImageConfig(**v)
+            k: ApptainerImageConfig.from_dict(v)
             for k, v in raw_apt.get("images", {}).items()
         }
         apptainer = ApptainerConfig(
@@ -127,20 +181,21 @@ def load_config(path: Optional[Path] = None) -> EulerFilesConfig:
             scratch_sif_dir=raw_apt.get("scratch_sif_dir", ""),
             base_image=raw_apt.get("base_image", "python:{version}-slim"),
             container_venv_path=raw_apt.get("container_venv_path", "/opt/venv"),
-            build_args=raw_apt.get("build_args", ["--fakeroot"]),
+            build_args=list(raw_apt.get("build_args", ["--fakeroot"])),
             images=images,
         )
 
     # Deserialize migration records if present
-    migrations = [MigrationRecord(**m) for m in raw.get("migrations", [])]
+    migrations = [MigrationRecord.from_dict(m) for m in raw.get("migrations", [])]
 
     return EulerFilesConfig(
         version=raw["version"],
         scratch_base=scratch_base,
         cache_root=raw.get("cache_root", ".cache/euler-files"),
         vars=vars_dict,
-        rsync_extra_args=raw.get("rsync_extra_args", []),
+        rsync_extra_args=list(raw.get("rsync_extra_args", [])),
         parallel_jobs=raw.get("parallel_jobs", 4),
+        intra_var_parallelism=raw.get("intra_var_parallelism", 1),
         lock_timeout_seconds=raw.get("lock_timeout_seconds", 300),
         skip_if_fresh_seconds=raw.get("skip_if_fresh_seconds", 3600),
         apptainer=apptainer,
@@ -148,6 +203,29 @@ def load_config(path: Optional[Path] = None) -> EulerFilesConfig:
     )
 
 
+def _read_raw(p: Path) -> Dict[str, Any]:
+    """Return the parsed JSON of a config file, re-reading it only if it changed.
+
+    The returned dict is shared with the cache and must not be modified.
+    """
+    try:
+        st = p.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Config not found at {p}. Run 'euler-files init' first.")
+
+    with _RAW_CACHE_LOCK:
+        cached = _RAW_CACHE.get(p)
+    if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+        return cached[2]
+
+    # json.loads takes bytes directly (and detects the encoding itself), so
+    # skip the text-mode read.
+    raw = json.loads(p.read_bytes())
+    with _RAW_CACHE_LOCK:
+        _RAW_CACHE[p] = (st.st_mtime_ns, st.st_size, raw)
+    return raw
+
+
 def save_config(config: EulerFilesConfig, path: Optional[Path] = None) -> None:
     """Save config to JSON file."""
     p = path or CONFIG_PATH
@@ -158,6 +236,7 @@ def save_config(config: EulerFilesConfig, path: Optional[Path] = None) -> None:
         "vars": {k: {"source": v.source, "enabled": v.enabled} for k, v in config.vars.items()},
         "rsync_extra_args": config.rsync_extra_args,
         "parallel_jobs": config.parallel_jobs,
+        "intra_var_parallelism": config.intra_var_parallelism,
         "lock_timeout_seconds": config.lock_timeout_seconds,
         "skip_if_fresh_seconds": config.skip_if_fresh_seconds,
     }
@@ -190,9 +269,23 @@ def save_config(config: EulerFilesConfig, path: Optional[Path] = None) -> None:
                     "sif_filename": v.sif_filename,
                     "built_at": v.built_at,
                     "enabled": v.enabled,
+                    "content_hash": v.content_hash,
                 }
                 for k, v in apt.images.items()
             },
         }
 
-    p.write_text(json.dumps(raw, indent=2) + "\n")
+    data = (json.dumps(raw, indent=2) + "\n").encode()
+    # If the file already holds exactly these bytes, skip the fsync and
+    # rename; that also keeps the mtime load_config's cache is keyed on.
+    try:
+        if p.read_bytes() == data:
+            return
+    except OSError:
+        pass
+
+    with _RAW_CACHE_LOCK:
+        _RAW_CACHE.pop(p, None)
+    # Written via rename so a concurrent load_config (or a crash mid-write)
+    # never sees a truncated file.
+    atomic_write(p, data)
@@ -7,10 +7,10 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Optional
 
-from euler_files.config import EulerFilesConfig
+from euler_files.config import SLOTS, EulerFilesConfig
 
 
-@dataclass
+@dataclass(**SLOTS)
 class CongruencyWarning:
     """A single mismatch between env var and config."""
 
@@ -35,10 +35,14 @@ def check_congruency(config: EulerFilesConfig) -> List[CongruencyWarning]:
         if env_val is None:
             # Env var not set — normal before eval $(euler-files sync) runs.
             continue
+        if env_val == vc.source:
+            # Identical strings (the usual case) can't disagree; skip the
+            # filesystem walk.
+            continue
         # Resolve both to absolute, normalized form
         try:
-            env_path = str(Path(env_val).resolve())
-            config_path = str(Path(vc.source).resolve())
+            env_path = os.path.realpath(env_val)
+            config_path = os.path.realpath(vc.source)
         except (OSError, ValueError):
             continue
         if env_path != config_path:
@@ -0,0 +1,151 @@
+"""Filesystem helpers shared by the commands: directory sizes, formatting
+and atomic file writes."""
+
+from __future__ import annotations
+
+import os
+import stat
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Set, Tuple
+
+from euler_files.sizecache import DirRecord, SizeCache
+
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+
+
+def format_size(size: int) -> str:
+    """Format a byte count as a human-readable string (e.g. "1.5 GB").
+
+    The unit is picked from the bit length of the size (every 10 bits is
+    one factor of 1024), so there's no per-unit division loop.
+    """
+    idx = min(len(_SIZE_UNITS) - 1, max(0, (size.bit_length() - 1) // 10))
+    return f"{size / (1 << (idx * 10)):.1f} {_SIZE_UNITS[idx]}"
+
+
+def dir_size_display(
+    path: Path, budget: float = 10.0, cache: Optional[SizeCache] = None
+) -> str:
+    """Get human-readable size of a directory.
+
+    Prefixed with ">" if the walk ran out of time and the size is a lower bound.
+    """
+    size, complete = dir_size(path, budget, cache)
+    text = format_size(size)
+    return text if complete else f">{text}"
+
+
+def dir_size(
+    path: Path, budget: float = 10.0, cache: Optional[SizeCache] = None
+) -> Tuple[int, bool]:
+    """Sum the disk usage of a directory tree, like ``du -s``.
+
+    Walks in-process with os.scandir instead of spawning du, and counts
+    hard-linked files once (uv hard-links venv files from its cache).
+    Stops after ``budget`` seconds and returns (partial_sum, False) so a huge
+    tree on a slow filesystem can't stall a command indefinitely. Like
+    ``du -x``, it stays on the filesystem of ``path``: anything mounted
+    inside the tree is skipped.
+
+    With a SizeCache, directories whose mtime hasn't changed since they were
+    last listed aren't listed again (see euler_files.sizecache).
+    """
+    deadline = time.monotonic() + budget
+    seen_inodes: Set[Tuple[int, int]] = set()
+    try:
+        root_st = os.lstat(path)
+    except OSError:
+        return 0, False
+    total = root_st.st_blocks * 512
+    dev = root_st.st_dev
+
+    stack = [str(path)]
+    while stack:
+        if time.monotonic() > deadline:
+            return total, False
+        directory = stack.pop()
+        if cache is None:
+            record = _list_dir(directory, 0, dev)
+        else:
+            try:
+                # Stat before listing: if the directory changes mid-listing,
+                # the record carries the older mtime and is redone next time.
+                mtime_ns = os.stat(directory).st_mtime_ns
+            except OSError:
+                continue
+            record = cache.get(directory, mtime_ns)
+            if record is None:
+                record = _list_dir(directory, mtime_ns, dev)
+                if record is not None:
+                    cache.put(directory, record)
+        if record is None:
+            continue
+
+        total += record.own_bytes
+        for dev, ino, size in record.links:
+            if (dev, ino) not in seen_inodes:
+                seen_inodes.add((dev, ino))
+                total += size
+        stack.extend(os.path.join(directory, name) for name in record.subdirs)
+    return total, True
+
+
+def _list_dir(directory: str, mtime_ns: int, dev: int) -> Optional[DirRecord]:
+    """List one directory into a DirRecord, or None if it can't be read.
+
+    Entries on a device other than ``dev`` (mount points) are left out.
+    """
+    own = 0
+    subdirs: List[str] = []
+    links: List[Tuple[int, int, int]] = []
+    try:
+        it = os.scandir(directory)
+    except OSError:
+        return None
+    with it:
+        for entry in it:
+            try:
+                st = entry.stat(follow_symlinks=False)
+                if st.st_dev != dev:
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.name)
+            except OSError:
+                continue
+            if st.st_nlink > 1 and not stat.S_ISDIR(st.st_mode):
+                links.append((st.st_dev, st.st_ino, st.st_blocks * 512))
+            else:
+                own += st.st_blocks * 512
+    return DirRecord(mtime_ns, time.time(), own, subdirs, links)
+
+
+def atomic_write(path: Path, data: bytes) -> None:
+    """Replace path with data so readers see either the old or the new file.
+
+    Writes a temp file next to path, fsyncs it and renames it over path; a
+    process killed halfway leaves at most a stray temp file, never a
+    truncated path. A symlinked path is written through (the link itself
+    stays), and an existing file keeps its permission bits.
+    """
+    path = Path(os.path.realpath(path))
+    try:
+        mode: Optional[int] = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = None
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            if mode is not None:
+                os.fchmod(f.fileno(), mode)
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            tmp.unlink()
+        except OSError:
+            pass
+        raise
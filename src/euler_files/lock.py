@@ -3,11 +3,13 @@
 from __future__ import annotations
 
 import fcntl
+import os
 import sys
+import threading
 import time
 from contextlib import contextmanager
 from pathlib import Path
-from typing import IO, Generator
+from typing import IO, Dict, Generator
 
 
 class LockTimeout(TimeoutError):
@@ -16,43 +18,88 @@ class LockTimeout(TimeoutError):
     pass
 
 
+# One threading.Lock per lock file, taken before the flock. flock() is
+# per open file, so it does serialise threads of this process, but sibling
+# threads would each poll the file; waiting on a thread lock instead wakes
+# them as soon as the holder is done.
+_THREAD_LOCKS: Dict[str, threading.Lock] = {}
+_THREAD_LOCKS_GUARD = threading.Lock()
+
+# First retry delay after a contended flock; doubled on every retry up to
+# the caller's poll_interval.
+_INITIAL_POLL = 0.01
+
+
 @contextmanager
 def acquire_lock(
     lock_path: Path,
-    timeout: int = 300,
+    timeout: float = 300,
     poll_interval: float = 0.5,
 ) -> Generator[IO, None, None]:
     """Acquire an exclusive flock on the given path.
 
     Uses polling with LOCK_NB (non-blocking) because we run inside
     ThreadPoolExecutor threads, and signal.alarm only works in the
-    main thread.
+    main thread. The delay between attempts starts small and backs off
+    exponentially to poll_interval, so short waits end quickly and long
+    waits don't spin; the wait is reported at most once per second.
+
+    Threads of this process queue on a per-path threading.Lock first and
+    only the one holding it touches the lock file.
     """
-    lock_path.parent.mkdir(parents=True, exist_ok=True)
     start = time.monotonic()
+    thread_lock = _thread_lock_for(lock_path)
+    if not thread_lock.acquire(timeout=timeout):
+        raise LockTimeout(
+            f"Could not acquire lock on {lock_path} after {timeout}s. "
+            "Another thread of this process is holding it."
+        )
+    try:
+        with _flock(lock_path, start, timeout, poll_interval) as fp:
+            yield fp
+    finally:
+        thread_lock.release()
+
+
+def _thread_lock_for(lock_path: Path) -> threading.Lock:
+    """Return the process-wide threading.Lock for a lock file."""
+    key = os.path.abspath(lock_path)
+    with _THREAD_LOCKS_GUARD:
+        return _THREAD_LOCKS.setdefault(key, threading.Lock())
+
+
+@contextmanager
+def _flock(
+    lock_path: Path, start: float, timeout: float, poll_interval: float
+) -> Generator[IO, None, None]:
+    """Take the flock itself, polling until ``timeout`` seconds after ``start``."""
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
 
     fp = open(lock_path, "w")
     try:
+        wait = _INITIAL_POLL
+        last_reported = -1
         while True:
             try:
                 fcntl.flock(fp.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
-                yield fp
-                return
-            except (OSError, BlockingIOError):
+                break
+            except OSError:
                 elapsed = time.monotonic() - start
                 if elapsed >= timeout:
                     raise LockTimeout(
                         f"Could not acquire lock on {lock_path} after {timeout}s. "
                         "Another euler-files sync may be running."
                     )
-                remaining = timeout - elapsed
-                wait = min(poll_interval, remaining)
-                print(
-                    f"[LOCK] Waiting for lock on {lock_path.name} "
-                    f"({elapsed:.0f}s/{timeout}s)...",
-                    file=sys.stderr,
-                )
-                time.sleep(wait)
+                if int(elapsed) > last_reported:
+                    last_reported = int(elapsed)
+                    print(
+                        f"[LOCK] Waiting for lock on {lock_path.name} "
+                        f"({elapsed:.0f}s/{timeout}s)...",
+                        file=sys.stderr,
+                    )
+                time.sleep(min(wait, timeout - elapsed))
+                wait = min(wait * 2, poll_interval)
+        yield fp
     finally:
         try:
             fcntl.flock(fp.fileno(), fcntl.LOCK_UN)
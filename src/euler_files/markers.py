@@ -8,10 +8,12 @@ the marker is fresh and the source hasn't changed.
 from __future__ import annotations
 
 import json
+import os
 import time
 from pathlib import Path
 
 from euler_files.config import EulerFilesConfig
+from euler_files.fsutil import atomic_write
 
 
 def should_skip(config: EulerFilesConfig, var_name: str, source: Path) -> bool:
@@ -24,12 +26,19 @@ def should_skip(config: EulerFilesConfig, var_name: str, source: Path) -> bool:
     """
     marker_path = config.marker_path_for(var_name)
 
-    if not marker_path.exists():
+    # One stat answers both "is there a marker?" and, via its mtime (the
+    # marker is rewritten on every sync), "is it obviously stale?" without
+    # reading and parsing it.
+    try:
+        marker_mtime = os.stat(marker_path).st_mtime
+    except OSError:
+        return False
+    if time.time() - marker_mtime > config.skip_if_fresh_seconds:
         return False
 
     try:
-        marker_data = json.loads(marker_path.read_text())
-    except (json.JSONDecodeError, OSError):
+        marker_data = json.loads(marker_path.read_bytes())
+    except (ValueError, OSError):  # JSONDecodeError or undecodable bytes
         return False
 
     marker_time = marker_data.get("synced_at", 0)
@@ -68,7 +77,9 @@ def write_marker(config: EulerFilesConfig, var_name: str, source: Path) -> None:
         "var_name": var_name,
         "source": str(source),
     }
-    marker_path.write_text(json.dumps(data))
+    # Atomic so a job killed mid-write can't leave a truncated marker that
+    # status reports as corrupt.
+    atomic_write(marker_path, json.dumps(data).encode())
 
 
 def _get_dir_mtime(path: Path) -> float:
@@ -78,12 +89,17 @@ def _get_dir_mtime(path: Path) -> float:
     maximum mtime found. This catches new files/dirs added and top-level
     modifications. Deep changes are caught by rsync itself.
     """
-    max_mtime = path.stat().st_mtime
+    max_mtime = os.stat(path).st_mtime
     try:
-        for child in path.iterdir():
-            child_mtime = child.stat().st_mtime
-            if child_mtime > max_mtime:
-                max_mtime = child_mtime
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    child_mtime = entry.stat().st_mtime
+                except FileNotFoundError:
+                    # Deleted since the listing, or a dangling symlink.
+                    continue
+                if child_mtime > max_mtime:
+                    max_mtime = child_mtime
     except PermissionError:
         pass
     return max_mtime
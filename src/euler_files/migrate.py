@@ -6,14 +6,13 @@ import os
 import shutil
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Tuple
-
-from rich.console import Console
-from rich.panel import Panel
-from rich.prompt import Confirm, Prompt
-from rich.table import Table
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
+from euler_files.apptainer.fixup import _rewrite_shebang
 from euler_files.config import (
     EulerFilesConfig,
     MigrationRecord,
@@ -22,7 +21,8 @@ from euler_files.config import (
 )
 from euler_files.rsync import run_rsync
 
-console = Console(stderr=True)
+if TYPE_CHECKING:
+    from rich.console import Console
 
 
 def run_migrate(
@@ -34,6 +34,15 @@ def run_migrate(
     config_path: Optional[Path] = None,
 ) -> None:
     """Migrate a cache or directory to a new location."""
+    if (what is None or to_path is None) and not sys.stdin.isatty():
+        # Fail before rendering the wizard rather than at its first prompt.
+        raise ValueError(
+            "Interactive migration needs a terminal; pass WHAT and --to instead."
+        )
+
+    from rich.prompt import Confirm, Prompt
+
+    console = _console()
     config = load_config(config_path)
 
     if what is None:
@@ -81,7 +90,7 @@ def run_migrate(
     # Step 1b: Fix venv internal paths if migrating venv_base
     old_path_str = str(old_path)
     if config_field == "venv_base":
-        _fixup_venvs(dest, old_path_str, new_path)
+        _fixup_venvs(dest, old_path_str, new_path, jobs=config.parallel_jobs)
 
     # Step 2: Update config
     _update_config_field(config, target_type, what, new_path)
@@ -132,8 +141,7 @@ def _resolve_target(
     # Check apptainer fields
     if config.apptainer is not None:
         if what == "venv_base":
-            raw = config.apptainer.venv_base
-            old = Path(os.path.expandvars(os.path.expanduser(raw)))
+            old = config.apptainer.venv_base_path()
             return ("apptainer", old, "venv_base")
         if what == "sif_store":
             old = config.apptainer.sif_store_path()
@@ -153,7 +161,7 @@ def _update_config_field(
 ) -> None:
     """Update the config field to point to the new path."""
     if target_type == "var":
-        config.vars[what].source = new_path
+        config.vars[what] = replace(config.vars[what], source=new_path)
     elif target_type == "apptainer":
         if what == "venv_base":
             config.apptainer.venv_base = new_path
@@ -168,6 +176,11 @@ def _interactive_select(
 
     Returns (what, to_path) or (None, None) if aborted.
     """
+    from rich.panel import Panel
+    from rich.prompt import Prompt
+    from rich.table import Table
+
+    console = _console()
     console.print()
     console.print(
         Panel.fit(
@@ -245,6 +258,9 @@ def _interactive_select(
 
 def _show_plan(what: str, old_path: str, new_path: str, keep_old: bool) -> None:
     """Display migration plan."""
+    from rich.table import Table
+
+    console = _console()
     console.print()
     table = Table(title=f"Migration Plan: {what}", border_style="yellow")
     table.add_column("Step", style="bold")
@@ -267,6 +283,9 @@ def _print_export_instructions(
     what: str, target_type: str, new_path: str
 ) -> None:
     """Print shell export lines the user needs to add to .bashrc."""
+    from rich.panel import Panel
+
+    console = _console()
     _err("")
     if target_type == "var":
         console.print(Panel(
@@ -297,66 +316,97 @@ def _print_export_instructions(
             ))
 
 
-def _fixup_venvs(new_base: Path, old_base_str: str, new_base_str: str) -> None:
+def _fixup_venvs(
+    new_base: Path, old_base_str: str, new_base_str: str, jobs: int = 4
+) -> None:
     """Fix internal paths in all venvs after migrating venv_base.
 
     Venvs contain hardcoded paths in:
     - bin/activate: VIRTUAL_ENV="/old/path/venvs/myenv"
     - bin/* shebangs: #!/old/path/venvs/myenv/bin/python
     These must be rewritten to the new location or python/pip won't work.
+
+    Venvs are fixed concurrently (up to ``jobs`` at a time); the work is
+    small reads and writes, so it is bound by filesystem latency.
     """
     if not new_base.is_dir():
         return
 
-    for child in sorted(new_base.iterdir()):
-        if not child.is_dir():
-            continue
+    children = [
+        child for child in sorted(new_base.iterdir())
         # Only process directories that look like venvs
-        if not (child / "pyvenv.cfg").exists():
-            continue
+        if child.is_dir() and (child / "pyvenv.cfg").exists()
+    ]
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        results = list(pool.map(
+            lambda c: _fixup_one_venv(c, old_base_str, new_base_str), children
+        ))
 
-        venv_name = child.name
-        old_venv = f"{old_base_str.rstrip('/')}/{venv_name}"
-        new_venv = f"{new_base_str.rstrip('/')}/{venv_name}"
+    for child, fixed in zip(children, results):
+        if fixed:
+            _err(f"  [FIXUP] {child.name}: rewrote {fixed} path(s)")
+
+
+def _fixup_one_venv(venv: Path, old_base_str: str, new_base_str: str) -> int:
+    """Rewrite one migrated venv's paths. Returns the number of files fixed."""
+    venv_name = venv.name
+    old_venv = f"{old_base_str.rstrip('/')}/{venv_name}"
+    new_venv = f"{new_base_str.rstrip('/')}/{venv_name}"
 
-        fixed = 0
+    old_bytes = os.fsencode(old_venv)
+    new_bytes = os.fsencode(new_venv)
+    fixed = 0
 
-        # Fix bin/activate VIRTUAL_ENV= line
-        activate = child / "bin" / "activate"
-        if activate.is_file():
+    # Fix bin/activate VIRTUAL_ENV= line. Worked on as bytes, like the
+    # shebangs below, so nothing is decoded and re-encoded.
+    bin_dir = venv / "bin"
+    activate = bin_dir / "activate"
+    try:
+        data = activate.read_bytes()
+    except OSError:
+        data = None
+    if data is not None:
+        if old_bytes not in data and new_bytes in data:
+            # Already points at the new location (e.g. created there after
+            # the copy); its scripts were written alongside it, so skip them.
+            return 0
+        new_data = data.replace(old_bytes, new_bytes)
+        if new_data != data:
             try:
-                text = activate.read_text()
-                new_text = text.replace(old_venv, new_venv)
-                if new_text != text:
-                    activate.write_text(new_text)
-                    fixed += 1
+                activate.write_bytes(new_data)
+                fixed += 1
             except OSError:
                 pass
 
-        # Fix shebangs in all bin/ scripts
-        bin_dir = child / "bin"
-        if bin_dir.is_dir():
-            for script in bin_dir.iterdir():
-                if not script.is_file() or script.name == "activate":
-                    continue
-                try:
-                    raw = script.read_bytes()
-                    # Only process text files with shebangs
-                    if not raw.startswith(b"#!"):
-                        continue
-                    text = raw.decode("utf-8", errors="replace")
-                    first_line, _, rest = text.partition("\n")
-                    new_first = first_line.replace(old_venv, new_venv)
-                    if new_first != first_line:
-                        script.write_text(new_first + "\n" + rest)
-                        fixed += 1
-                except OSError:
-                    pass
+    # Fix shebangs in all bin/ scripts; only the first line of each is
+    # touched and binary files (no "#!") are left alone.
+    try:
+        with os.scandir(bin_dir) as it:
+            entries = list(it)
+    except OSError:
+        entries = []
 
-        if fixed:
-            _err(f"  [FIXUP] {venv_name}: rewrote {fixed} path(s)")
+    for entry in entries:
+        if entry.name == "activate" or not entry.is_file(follow_symlinks=False):
+            continue
+        try:
+            if _rewrite_shebang(entry.path, old_bytes, new_bytes, dry_run=False):
+                fixed += 1
+        except OSError:
+            pass
+
+    return fixed
 
 
 def _err(msg: str) -> None:
     """Print to stderr."""
     print(msg, file=sys.stderr)
+
+
+@lru_cache(maxsize=None)
+def _console() -> Console:
+    """Stderr console, created on first use so importing this module
+    doesn't import rich."""
+    from rich.console import Console
+
+    return Console(stderr=True)
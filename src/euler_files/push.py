@@ -53,7 +53,6 @@ def run_push(
             continue
 
         lock_path = config.lock_path_for(name)
-        lock_path.parent.mkdir(parents=True, exist_ok=True)
 
         try:
             with acquire_lock(lock_path, timeout=config.lock_timeout_seconds):
@@ -20,25 +20,32 @@ def run_rsync(
     extra_args: Optional[List[str]] = None,
     verbose: bool = False,
     delete: bool = False,
+    files_from: Optional[Path] = None,
 ) -> None:
     """Run rsync to sync source to target.
 
     Trailing slash on source is critical: copies contents of source
     into target, not source itself as a subdirectory.
 
+    files_from restricts the transfer to the NUL-separated paths (relative
+    to source) listed in that file; listed directories are copied recursively.
+
     rsync output is suppressed; only warnings/errors are printed to stderr.
     """
+    # No progress/format flags: stdout goes to DEVNULL, so rsync would only
+    # be computing output nobody reads.
     cmd = [
         "rsync",
         "-a",  # archive mode (preserves permissions, timestamps, etc.)
-        "--info=progress2",  # overall progress (not per-file)
-        "--info=name0",  # suppress individual file names
-        "--human-readable",
     ]
 
     if delete:
         cmd.append("--delete")
 
+    if files_from is not None:
+        # --files-from turns off the recursion implied by -a
+        cmd.extend(["--recursive", f"--files-from={files_from}", "--from0"])
+
     if extra_args:
         cmd.extend(extra_args)
 
@@ -79,8 +86,6 @@ def rsync_file(
     cmd = [
         "rsync",
         "-a",
-        "--info=progress2",
-        "--human-readable",
     ]
 
     if extra_args:
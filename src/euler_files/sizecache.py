@@ -0,0 +1,91 @@
+"""Persistent per-directory size records for repeated tree walks.
+
+A directory's mtime changes whenever an entry is added, removed or renamed
+in it, but not when something deeper in the tree changes. So instead of
+caching whole-tree totals, each record holds what a walk learned from
+listing one directory: the bytes of its direct entries, the names of its
+subdirectories and its hard-linked files. dir_size() still stats every
+directory, but re-lists (and stats the files of) only those whose mtime
+moved. Rewriting an existing file in place doesn't touch the directory, so
+records also expire after ``max_age`` seconds.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+_CACHE_VERSION = 2  # 2: records no longer include other filesystems
+
+
+class DirRecord(NamedTuple):
+    """What one listing of a directory contributed to its tree's size."""
+
+    mtime_ns: int
+    scanned_at: float
+    own_bytes: int  # entries with a single link, including subdirectory inodes
+    subdirs: List[str]  # names, relative to the directory
+    links: List[Tuple[int, int, int]]  # (st_dev, st_ino, bytes) of hard-linked files
+
+
+class SizeCache:
+    """DirRecords keyed on absolute directory path, stored as one JSON file.
+
+    Safe to share between threads; call save() once the walks are done.
+    """
+
+    def __init__(self, path: Path, max_age: float) -> None:
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._records: Dict[str, DirRecord] = {}
+        self._dirty = False
+        try:
+            raw = json.loads(path.read_bytes())
+        except (OSError, ValueError):
+            return
+        if raw.get("version") != _CACHE_VERSION:
+            return
+        now = time.time()
+        for key, rec in raw.get("dirs", {}).items():
+            record = DirRecord(
+                rec[0], rec[1], rec[2], rec[3], [tuple(link) for link in rec[4]]
+            )
+            if now - record.scanned_at <= max_age:
+                self._records[key] = record
+
+    def get(self, directory: str, mtime_ns: int) -> Optional[DirRecord]:
+        """Return the record for directory if it was made at this mtime."""
+        with self._lock:
+            record = self._records.get(directory)
+        if record is None or record.mtime_ns != mtime_ns:
+            return None
+        return record
+
+    def put(self, directory: str, record: DirRecord) -> None:
+        with self._lock:
+            self._records[directory] = record
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the records back if anything changed. Failures are ignored;
+        the cache only ever saves work."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {
+                "version": _CACHE_VERSION,
+                "dirs": {key: list(rec) for key, rec in self._records.items()},
+            }
+            self._dirty = False
+        # Imported here: fsutil imports this module for DirRecord.
+        from euler_files.fsutil import atomic_write
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write(self.path, json.dumps(data, separators=(",", ":")).encode())
+        except OSError:
+            pass
@@ -3,14 +3,17 @@
 from __future__ import annotations
 
 import json
-import subprocess
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Optional
 
 from rich.console import Console
 from rich.table import Table
 
 from euler_files.config import load_config
+from euler_files.fsutil import dir_size_display
+from euler_files.sizecache import SizeCache
 
 console = Console()
 
@@ -31,29 +34,48 @@ def show_status() -> None:
     table.add_column("Last Synced", justify="right")
     table.add_column("Status")
 
-    for name, vc in config.vars.items():
-        if not vc.enabled:
-            continue
+    enabled = [(name, vc) for name, vc in config.vars.items() if vc.enabled]
+    scratch_base = Path(config.scratch_base) / config.cache_root
 
+    # Size every tree up front and concurrently: each walk spends its time
+    # waiting on the filesystem, and the source trees often sit on a
+    # different (slower) filesystem than scratch.
+    size_paths = [Path(vc.source) for _, vc in enabled]
+    size_paths += [config.scratch_dir_for(name) for name, _ in enabled]
+    size_paths.append(scratch_base)
+    # Unchanged directories are remembered between runs, so repeated status
+    # calls only list what moved. Records expire so in-place rewrites (which
+    # don't bump the directory mtime) are eventually counted.
+    cache = SizeCache(
+        scratch_base / ".sizecache.json",
+        max_age=config.skip_if_fresh_seconds * 10,
+    )
+    with ThreadPoolExecutor(max_workers=config.parallel_jobs) as pool:
+        sizes = dict(zip(
+            size_paths, pool.map(lambda p: _get_size(p, cache), size_paths)
+        ))
+    cache.save()
+
+    for name, vc in enabled:
         source_path = Path(vc.source)
         scratch_path = config.scratch_dir_for(name)
         marker_path = config.marker_path_for(name)
 
         # Sizes
-        source_size = _get_size(source_path)
-        scratch_size = _get_size(scratch_path)
+        source_size = sizes[source_path]
+        scratch_size = sizes[scratch_path]
 
         # Last synced from marker
         last_synced = "never"
         stale = True
         if marker_path.exists():
             try:
-                marker_data = json.loads(marker_path.read_text())
+                marker_data = json.loads(marker_path.read_bytes())
                 synced_at = marker_data.get("synced_at", 0)
                 age = time.time() - synced_at
                 last_synced = _format_age(age)
                 stale = age > config.skip_if_fresh_seconds
-            except (json.JSONDecodeError, OSError):
+            except (ValueError, OSError):
                 last_synced = "corrupt"
 
         # Status
@@ -71,27 +93,15 @@ def show_status() -> None:
     console.print(table)
 
     # Summary
-    scratch_base = Path(config.scratch_base) / config.cache_root
-    total = _get_size(scratch_base)
+    total = sizes[scratch_base]
     console.print(f"\nTotal scratch usage: [bold]{total}[/bold]")
 
 
-def _get_size(path: Path) -> str:
+def _get_size(path: Path, cache: Optional[SizeCache] = None) -> str:
     """Get human-readable size of a directory."""
     if not path.exists():
         return "-"
-    try:
-        result = subprocess.run(
-            ["du", "-sh", str(path)],
-            capture_output=True,
-            text=True,
-            timeout=30,
-        )
-        if result.returncode == 0:
-            return result.stdout.split()[0]
-    except (subprocess.TimeoutExpired, FileNotFoundError, IndexError):
-        pass
-    return "?"
+    return dir_size_display(path, budget=30.0, cache=cache)
 
 
 def _format_age(seconds: float) -> str:
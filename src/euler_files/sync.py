@@ -2,17 +2,28 @@
 
 from __future__ import annotations
 
+import heapq
 import os
+import re
 import sys
+import tempfile
+import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from euler_files.config import EulerFilesConfig, VarConfig, load_config
+from euler_files.fsutil import dir_size
 from euler_files.lock import acquire_lock
 from euler_files.markers import should_skip, write_marker
 from euler_files.rsync import run_rsync
 
+# Characters that never need quoting in a POSIX shell word.
+_SAFE_SHELL_RE = re.compile(r"[A-Za-z0-9/_.\-]+")
+
+# Seconds _partition_tree may spend sizing a variable's tree in total.
+_PARTITION_SIZE_BUDGET = 5.0
+
 
 def run_sync(
     dry_run: bool = False,
@@ -75,26 +86,26 @@ def run_sync(
                 errors.append(f"{name}: {exc}")
                 _err(f"  [ERROR] Failed to sync {name}: {exc}")
 
-    # Summary: show what will be exported
-    _err("")
-    _err("Environment variables:")
+    # Summary: show what will be exported. Both blocks are built up front
+    # and written in one go, so a long var list doesn't interleave with
+    # other jobs' output line by line.
+    summary = ["", "Environment variables:"]
     for name in sorted(results):
         scratch_path = results[name]
         old_val = os.environ.get(name)
+        summary.append(f"  {name}")
         if old_val:
-            _err(f"  {name}")
-            _err(f"    was: {old_val}")
-            _err(f"    now: {scratch_path}")
+            summary.append(f"    was: {old_val}")
+            summary.append(f"    now: {scratch_path}")
         else:
-            _err(f"  {name}")
-            _err(f"    set: {scratch_path}")
-
-    _err("")
+            summary.append(f"    set: {scratch_path}")
+    summary.append("")
+    _err("\n".join(summary))
 
     # Output export statements to stdout (this is what eval captures)
-    for name in sorted(results):
-        scratch_path = results[name]
-        print(f"export {name}={_shell_quote(str(scratch_path))}")
+    sys.stdout.write("".join(
+        f"export {name}={_shell_quote(str(results[name]))}\n" for name in sorted(results)
+    ))
 
     if errors:
         _err(f"{len(errors)} variable(s) failed to sync.")
@@ -131,23 +142,113 @@ def _sync_one_var(
 
     # Acquire flock (per-var lock file)
     lock_path = config.lock_path_for(var_name)
-    lock_path.parent.mkdir(parents=True, exist_ok=True)
 
     with acquire_lock(lock_path, timeout=config.lock_timeout_seconds):
         _err(f"  [SYNC] {var_name}: {source} -> {target}")
         target.mkdir(parents=True, exist_ok=True)
 
+        partitions: List[List[Path]] = []
+        if config.intra_var_parallelism > 1:
+            partitions = _partition_tree(source, config.intra_var_parallelism)
+
+        if len(partitions) > 1:
+            with ThreadPoolExecutor(max_workers=len(partitions)) as pool:
+                list(pool.map(
+                    lambda part: _rsync_partition(config, source, target, part, verbose),
+                    partitions,
+                ))
+        else:
+            run_rsync(
+                source=source,
+                target=target,
+                extra_args=config.rsync_extra_args,
+                verbose=verbose,
+            )
+
+        write_marker(config, var_name, source)
+
+    return target
+
+
+def _partition_tree(source: Path, n: int) -> List[List[Path]]:
+    """Split the entries of source into at most n lists of similar total size.
+
+    Paths are relative to source. Top-level entries are the unit of work;
+    if there are fewer than n of them (HF_HOME is mostly hub/ and
+    datasets/), the top-level directories are split into their children.
+    Empty lists are dropped.
+    """
+    entries = _list_entries(source, Path())
+    if len(entries) < n:
+        expanded: List[Tuple[Path, bool]] = []
+        for rel, is_dir in entries:
+            children = _list_entries(source / rel, rel) if is_dir else []
+            expanded.extend(children or [(rel, is_dir)])
+        entries = expanded
+
+    # Size the units concurrently under one shared deadline, so a large
+    # tree delays the first rsync by at most _PARTITION_SIZE_BUDGET.
+    deadline = time.monotonic() + _PARTITION_SIZE_BUDGET
+    with ThreadPoolExecutor(max_workers=n) as pool:
+        sizes = list(pool.map(
+            lambda e: _entry_size(source / e[0], e[1], deadline), entries
+        ))
+    sized = list(zip(sizes, (rel for rel, _ in entries)))
+    sized.sort(key=lambda item: item[0], reverse=True)
+
+    # Largest first onto the currently lightest list.
+    bins: List[Tuple[int, int]] = [(0, i) for i in range(n)]
+    parts: List[List[Path]] = [[] for _ in range(n)]
+    for size, rel in sized:
+        total, i = heapq.heappop(bins)
+        parts[i].append(rel)
+        heapq.heappush(bins, (total + size, i))
+    return [part for part in parts if part]
+
+
+def _list_entries(directory: Path, rel: Path) -> List[Tuple[Path, bool]]:
+    """Return (relative path, is_dir) for each entry of directory."""
+    try:
+        with os.scandir(directory) as it:
+            return [(rel / e.name, e.is_dir(follow_symlinks=False)) for e in it]
+    except OSError:
+        return []
+
+
+def _entry_size(path: Path, is_dir: bool, deadline: float) -> int:
+    """Disk usage of one partition unit, in bytes.
+
+    Directories are walked until ``deadline`` (a time.monotonic() value);
+    past it their partial size is used, which only makes the split less
+    even.
+    """
+    if is_dir:
+        return dir_size(path, budget=max(0.0, deadline - time.monotonic()))[0]
+    try:
+        return path.lstat().st_blocks * 512
+    except OSError:
+        return 0
+
+
+def _rsync_partition(
+    config: EulerFilesConfig,
+    source: Path,
+    target: Path,
+    paths: List[Path],
+    verbose: bool,
+) -> None:
+    """rsync only the given source-relative paths into target."""
+    with tempfile.NamedTemporaryFile(prefix="euler-files-", suffix=".list") as f:
+        f.write(b"\0".join(os.fsencode(p) for p in paths))
+        f.flush()
         run_rsync(
             source=source,
             target=target,
             extra_args=config.rsync_extra_args,
             verbose=verbose,
+            files_from=Path(f.name),
         )
 
-        write_marker(config, var_name, source)
-
-    return target
-
 
 def _err(msg: str) -> None:
     """Print to stderr (never pollute stdout)."""
@@ -156,7 +257,7 @@ def _err(msg: str) -> None:
 
 def _shell_quote(s: str) -> str:
     """Quote a string for safe shell usage."""
-    if all(c.isalnum() or c in "/-_." for c in s):
+    if _SAFE_SHELL_RE.fullmatch(s):
         return s
     return "'" + s.replace("'", "'\\''") + "'"
 
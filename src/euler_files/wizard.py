@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import os
-import subprocess
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
@@ -19,13 +21,26 @@ from euler_files.config import (
     load_config,
     save_config,
 )
-from euler_files.constants import PRESET_DESCRIPTIONS, PRESETS
+from euler_files.constants import PRESETS
+from euler_files.fsutil import dir_size_display
 
 console = Console(stderr=True)
 
 
+@lru_cache(maxsize=256)
+def _expand(path: str) -> str:
+    """Expand ~ and environment variables in a user-entered path.
+
+    Cached because the same answer is expanded at several steps; the cache is
+    cleared at the start of each wizard run so it never outlives the
+    environment it was computed from.
+    """
+    return os.path.expandvars(os.path.expanduser(path))
+
+
 def run_wizard() -> None:
     """Run the interactive setup wizard."""
+    _expand.cache_clear()
     console.print()
     console.print(
         Panel.fit(
@@ -99,7 +114,7 @@ def _detect_scratch() -> str:
             "Enter scratch directory path",
             console=console,
         )
-        expanded = os.path.expandvars(os.path.expanduser(path))
+        expanded = _expand(path)
         if Path(expanded).is_dir():
             return path
         console.print(f"  [red]Directory {expanded} does not exist.[/red]")
@@ -124,9 +139,19 @@ def _select_vars() -> List[str]:
 
     selected: List[str] = []
 
+    # Size every existing preset in the background; each walk can take
+    # seconds on a cold cache, and most of them finish while the user is
+    # answering the earlier prompts.
+    pool = ThreadPoolExecutor(max_workers=8)
+    sizes: Dict[str, Future] = {}
+    for name, (rel_path, _) in PRESETS.items():
+        check_path = Path(os.environ.get(name) or Path.home() / rel_path)
+        if check_path.exists():
+            sizes[name] = pool.submit(dir_size_display, check_path)
+    pool.shutdown(wait=False)
+
     # Show presets
-    for name, rel_path in PRESETS.items():
-        desc = PRESET_DESCRIPTIONS.get(name, "")
+    for name, (rel_path, desc) in PRESETS.items():
         abs_path = Path.home() / rel_path
         env_val = os.environ.get(name)
 
@@ -138,11 +163,13 @@ def _select_vars() -> List[str]:
         else:
             display_path = f"~/{rel_path} [dim](not found)[/dim]"
 
-        # Get size if path exists
+        # Size if the path exists and the walk is done by now
         size_str = ""
-        check_path = env_val or str(abs_path)
-        if Path(check_path).exists():
-            size_str = _get_size_display(Path(check_path))
+        if name in sizes:
+            try:
+                size_str = sizes[name].result(timeout=0.1)
+            except FutureTimeout:
+                size_str = "…"
 
         label = f"  [bold]{name}[/bold]  {display_path}"
         if size_str:
@@ -182,8 +209,8 @@ def _configure_vars(selected: List[str]) -> Dict[str, VarConfig]:
     for name in selected:
         # Try to auto-detect source
         env_val = os.environ.get(name)
-        default_rel = PRESETS.get(name)
-        default_abs = str(Path.home() / default_rel) if default_rel else None
+        preset = PRESETS.get(name)
+        default_abs = str(Path.home() / preset.path) if preset else None
 
         if env_val and Path(env_val).exists():
             source = env_val
@@ -199,7 +226,7 @@ def _configure_vars(selected: List[str]) -> Dict[str, VarConfig]:
                 f"  Source path for {name}",
                 console=console,
             )
-            source = os.path.expandvars(os.path.expanduser(source))
+            source = _expand(source)
 
         vars_config[name] = VarConfig(source=source)
 
@@ -208,29 +235,23 @@ def _configure_vars(selected: List[str]) -> Dict[str, VarConfig]:
 
 def _warn_overlaps(vars_config: Dict[str, VarConfig]) -> None:
     """Warn if any source path is a subdirectory of another."""
-    items = list(vars_config.items())
-    for i, (name_a, vc_a) in enumerate(items):
-        for name_b, vc_b in items[i + 1 :]:
-            path_a = Path(vc_a.source).resolve()
-            path_b = Path(vc_b.source).resolve()
-            try:
-                path_b.relative_to(path_a)
-                console.print(
-                    f"\n  [yellow]Warning:[/yellow] {name_b} ({vc_b.source}) "
-                    f"is inside {name_a} ({vc_a.source}).\n"
-                    f"  Syncing both will duplicate data. Consider managing only {name_a}."
-                )
-            except ValueError:
-                pass
-            try:
-                path_a.relative_to(path_b)
-                console.print(
-                    f"\n  [yellow]Warning:[/yellow] {name_a} ({vc_a.source}) "
-                    f"is inside {name_b} ({vc_b.source}).\n"
-                    f"  Syncing both will duplicate data. Consider managing only {name_b}."
-                )
-            except ValueError:
-                pass
+    # Resolve each source once and walk them in sorted order: every path
+    # that contains the current one is then still on the stack.
+    resolved = sorted(
+        (str(Path(vc.source).resolve()).rstrip("/") + "/", name, vc.source)
+        for name, vc in vars_config.items()
+    )
+    stack: List[Tuple[str, str, str]] = []
+    for path, name, source in resolved:
+        while stack and not path.startswith(stack[-1][0]):
+            stack.pop()
+        for _, outer_name, outer_source in stack:
+            console.print(
+                f"\n  [yellow]Warning:[/yellow] {name} ({source}) "
+                f"is inside {outer_name} ({outer_source}).\n"
+                f"  Syncing both will duplicate data. Consider managing only {outer_name}."
+            )
+        stack.append((path, name, source))
 
 
 def _advanced_settings() -> Tuple[int, int, int]:
@@ -257,19 +278,25 @@ def _show_summary(config: EulerFilesConfig) -> None:
     table.add_column("Scratch Target")
     table.add_column("Size", justify="right")
 
-    for name, vc in config.vars.items():
-        source_path = Path(vc.source)
+    sources = [Path(vc.source) for vc in config.vars.values()]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        sizes = list(pool.map(_summary_size, sources))
+
+    for (name, vc), size in zip(config.vars.items(), sizes):
         target = str(config.scratch_dir_for(name))
         # Show unexpanded scratch path for display
         display_target = target.replace(
             os.path.expandvars(config.scratch_base), config.scratch_base
         )
-        size = _get_size_display(source_path) if source_path.exists() else "[dim]n/a[/dim]"
         table.add_row(name, vc.source, display_target, size)
 
     console.print(table)
 
 
+def _summary_size(path: Path) -> str:
+    return dir_size_display(path) if path.exists() else "[dim]n/a[/dim]"
+
+
 def _show_next_steps() -> None:
     """Print usage instructions."""
     console.print()
@@ -288,19 +315,3 @@ def _show_next_steps() -> None:
         border_style="green",
         padding=(1, 2),
     ))
-
-
-def _get_size_display(path: Path) -> str:
-    """Get human-readable size of a directory."""
-    try:
-        result = subprocess.run(
-            ["du", "-sh", str(path)],
-            capture_output=True,
-            text=True,
-            timeout=10,
-        )
-        if result.returncode == 0:
-            return result.stdout.split()[0]
-    except (subprocess.TimeoutExpired, FileNotFoundError, IndexError):
-        pass
-    return "?"
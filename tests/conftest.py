@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import pytest
 from pathlib import Path
+from typing import Callable, Optional
 
 from euler_files.config import EulerFilesConfig, VarConfig, save_config
 
@@ -43,3 +44,40 @@ def sample_config(tmp_path: Path, tmp_scratch: Path, tmp_source: Path) -> Path:
     config_path = tmp_path / "euler-files.json"
     save_config(config, path=config_path)
     return config_path
+
+
+@pytest.fixture
+def make_venv() -> Callable[..., Path]:
+    """Factory for mock uv venvs: pyvenv.cfg, bin/activate, scripts with
+    shebangs, a python stub and a binary file.
+
+    Paths inside the scripts point at virtual_env_path, or at the venv's
+    own location when it's omitted.
+    """
+
+    def _make(
+        base: Path,
+        name: str,
+        virtual_env_path: Optional[str] = None,
+        version_info: str = "3.11.5",
+    ) -> Path:
+        venv = base / name
+        bin_dir = venv / "bin"
+        bin_dir.mkdir(parents=True)
+        (venv / "pyvenv.cfg").write_text(f"home = /usr/bin\nversion_info = {version_info}\n")
+
+        path_in_scripts = virtual_env_path or str(venv)
+        (bin_dir / "activate").write_text(
+            f'VIRTUAL_ENV="{path_in_scripts}"\n'
+            f'export VIRTUAL_ENV\n'
+            f'PATH="$VIRTUAL_ENV/bin:$PATH"\n'
+        )
+        (bin_dir / "pip").write_text(
+            f"#!{path_in_scripts}/bin/python\nimport sys\nsys.exit(0)\n"
+        )
+        (bin_dir / "uv").write_text(f"#!{path_in_scripts}/bin/python3\nimport uv\n")
+        (bin_dir / "python").write_text("#!/usr/bin/env python3\n")
+        (bin_dir / "data.bin").write_bytes(b"\x00\x01\x02")
+        return venv
+
+    return _make
@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import tempfile
 from pathlib import Path
+from typing import Callable
 from unittest.mock import patch, MagicMock, call
 
 import pytest
@@ -15,7 +17,8 @@ from euler_files.config import (
     load_config,
     save_config,
 )
-from euler_files.apptainer.build import run_build, _create_tarball
+from euler_files.apptainer.build import run_build, _create_tarball, _venv_content_hash
+from euler_files.apptainer.venv import parse_pyvenv_cfg
 
 
 def _make_config(tmp_path: Path, venv_base: Path) -> Path:
@@ -38,14 +41,24 @@ def _make_config(tmp_path: Path, venv_base: Path) -> Path:
     return config_path
 
 
-def _make_venv(base: Path, name: str) -> Path:
-    """Create a mock venv."""
-    venv = base / name
-    venv.mkdir(parents=True)
-    (venv / "pyvenv.cfg").write_text("version_info = 3.11.5\nhome = /usr/bin\n")
-    (venv / "bin").mkdir()
-    (venv / "bin" / "python").write_text("#!/usr/bin/env python3\n")
-    return venv
+@pytest.fixture(autouse=True)
+def _apptainer_on_path():
+    """Pretend apptainer is installed; run_build resolves it before packing."""
+    with patch(
+        "euler_files.apptainer.build._which", return_value="/opt/apptainer/bin/apptainer"
+    ) as which:
+        yield which
+
+
+def _fake_tar(venv_path: Path, tar_path: Path) -> None:
+    """Stand-in for _create_tarball: writes a placeholder tarball."""
+    tar_path.write_bytes(b"fake-tar-content")
+
+
+def _fake_apptainer(cmd, **kwargs) -> MagicMock:
+    """Stand-in for a successful `apptainer build`: writes the target image."""
+    Path(cmd[-2]).write_bytes(b"fake-sif-content")
+    return MagicMock(returncode=0)
 
 
 class TestRunBuild:
@@ -66,29 +79,34 @@ class TestRunBuild:
             run_build(venv_name="nonexistent", config_path=config_path)
 
     @patch("euler_files.apptainer.build.subprocess.run")
-    def test_dry_run(self, mock_run: MagicMock, tmp_path: Path) -> None:
+    def test_dry_run(
+        self, mock_run: MagicMock, tmp_path: Path, make_venv: Callable[..., Path]
+    ) -> None:
         venv_base = tmp_path / "venvs"
-        _make_venv(venv_base, "my-env")
+        make_venv(venv_base, "my-env")
         config_path = _make_config(tmp_path, venv_base)
 
-        run_build(venv_name="my-env", dry_run=True, config_path=config_path)
+        with patch("euler_files.apptainer.build._venv_content_hash") as mock_hash:
+            run_build(venv_name="my-env", dry_run=True, config_path=config_path)
 
-        # Neither tar nor apptainer should be called
+        # Neither tar nor apptainer should be called, and the venv isn't hashed
         mock_run.assert_not_called()
+        mock_hash.assert_not_called()
 
     @patch("euler_files.apptainer.build._create_tarball")
     @patch("euler_files.apptainer.build.subprocess.run")
     def test_successful_build(
-        self, mock_run: MagicMock, mock_tar: MagicMock, tmp_path: Path
+        self,
+        mock_run: MagicMock,
+        mock_tar: MagicMock,
+        tmp_path: Path,
+        make_venv: Callable[..., Path],
     ) -> None:
-        mock_run.return_value = MagicMock(returncode=0)
-        # Simulate tar creating the file
-        def fake_tar(venv_path, tar_path):
-            tar_path.write_bytes(b"fake-tar-content")
-        mock_tar.side_effect = fake_tar
+        mock_run.side_effect = _fake_apptainer
+        mock_tar.side_effect = _fake_tar
 
         venv_base = tmp_path / "venvs"
-        _make_venv(venv_base, "my-env")
+        make_venv(venv_base, "my-env")
         config_path = _make_config(tmp_path, venv_base)
 
         run_build(venv_name="my-env", config_path=config_path)
@@ -102,12 +120,17 @@ class TestRunBuild:
         # Verify apptainer build was called
         mock_run.assert_called_once()
         cmd = mock_run.call_args[0][0]
-        assert cmd[0] == "apptainer"
+        assert cmd[0] == "/opt/apptainer/bin/apptainer"
         assert cmd[1] == "build"
         assert "--fakeroot" in cmd
         assert any(c.endswith("my-env.sif") for c in cmd)
         assert any(c.endswith("my-env.def") for c in cmd)
 
+        # Image is built in local staging and then moved into sif_store
+        assert Path(cmd[-2]).parent != tmp_path / "sif-store"
+        assert not Path(cmd[-2]).exists()
+        assert (tmp_path / "sif-store" / "my-env.sif").read_bytes() == b"fake-sif-content"
+
         # Verify config was updated with image
         loaded = load_config(path=config_path)
         assert "my-env" in loaded.apptainer.images
@@ -121,31 +144,91 @@ class TestRunBuild:
         assert not tar_path.exists()
 
     @patch("euler_files.apptainer.build.subprocess.run")
-    def test_skip_existing_sif(self, mock_run: MagicMock, tmp_path: Path) -> None:
+    def test_skip_existing_sif(
+        self, mock_run: MagicMock, tmp_path: Path, make_venv: Callable[..., Path]
+    ) -> None:
         venv_base = tmp_path / "venvs"
-        _make_venv(venv_base, "my-env")
+        make_venv(venv_base, "my-env")
         config_path = _make_config(tmp_path, venv_base)
 
         # Create existing .sif
         sif_store = tmp_path / "sif-store"
         (sif_store / "my-env.sif").write_bytes(b"existing")
 
+        with patch("euler_files.apptainer.build._venv_content_hash") as mock_hash:
+            run_build(venv_name="my-env", config_path=config_path)
+
+        mock_run.assert_not_called()
+        mock_hash.assert_not_called()  # no recorded fingerprint to compare
+
+    @patch("euler_files.apptainer.build.subprocess.run")
+    def test_skip_when_hash_matches(
+        self, mock_run: MagicMock, tmp_path: Path, make_venv: Callable[..., Path]
+    ) -> None:
+        venv_base = tmp_path / "venvs"
+        venv = make_venv(venv_base, "my-env")
+        config_path = _make_config(tmp_path, venv_base)
+        config = load_config(config_path)
+        config.apptainer.images["my-env"] = ApptainerImageConfig(
+            venv_name="my-env",
+            python_version="3.11.5",
+            sif_filename="my-env.sif",
+            content_hash=_venv_content_hash(venv),
+        )
+        save_config(config, path=config_path)
+        (tmp_path / "sif-store" / "my-env.sif").write_bytes(b"existing")
+
         run_build(venv_name="my-env", config_path=config_path)
 
         mock_run.assert_not_called()
 
+    @patch("euler_files.apptainer.build._create_tarball")
+    @patch("euler_files.apptainer.build.subprocess.run")
+    def test_changed_venv_rebuilds(
+        self,
+        mock_run: MagicMock,
+        mock_tar: MagicMock,
+        tmp_path: Path,
+        make_venv: Callable[..., Path],
+    ) -> None:
+        mock_run.side_effect = _fake_apptainer
+        mock_tar.side_effect = _fake_tar
+
+        venv_base = tmp_path / "venvs"
+        venv = make_venv(venv_base, "my-env")
+        config_path = _make_config(tmp_path, venv_base)
+        config = load_config(config_path)
+        config.apptainer.images["my-env"] = ApptainerImageConfig(
+            venv_name="my-env",
+            python_version="3.11.5",
+            sif_filename="my-env.sif",
+            content_hash=_venv_content_hash(venv),
+        )
+        save_config(config, path=config_path)
+        (tmp_path / "sif-store" / "my-env.sif").write_bytes(b"existing")
+
+        (venv / "lib").mkdir()
+        (venv / "lib" / "new_pkg.py").write_text("x = 1\n")
+        run_build(venv_name="my-env", config_path=config_path)
+
+        mock_run.assert_called_once()
+        stored = load_config(config_path).apptainer.images["my-env"].content_hash
+        assert stored == _venv_content_hash(venv)
+
     @patch("euler_files.apptainer.build._create_tarball")
     @patch("euler_files.apptainer.build.subprocess.run")
     def test_force_rebuilds_existing(
-        self, mock_run: MagicMock, mock_tar: MagicMock, tmp_path: Path
+        self,
+        mock_run: MagicMock,
+        mock_tar: MagicMock,
+        tmp_path: Path,
+        make_venv: Callable[..., Path],
     ) -> None:
-        mock_run.return_value = MagicMock(returncode=0)
-        def fake_tar(venv_path, tar_path):
-            tar_path.write_bytes(b"fake-tar-content")
-        mock_tar.side_effect = fake_tar
+        mock_run.side_effect = _fake_apptainer
+        mock_tar.side_effect = _fake_tar
 
         venv_base = tmp_path / "venvs"
-        _make_venv(venv_base, "my-env")
+        make_venv(venv_base, "my-env")
         config_path = _make_config(tmp_path, venv_base)
 
         # Create existing .sif
@@ -156,19 +239,40 @@ class TestRunBuild:
 
         mock_tar.assert_called_once()
         mock_run.assert_called_once()
+        assert (sif_store / "my-env.sif").read_bytes() == b"fake-sif-content"
+
+    @patch("euler_files.apptainer.build._create_tarball")
+    def test_missing_apptainer_fails_before_packing(
+        self,
+        mock_tar: MagicMock,
+        tmp_path: Path,
+        make_venv: Callable[..., Path],
+        _apptainer_on_path: MagicMock,
+    ) -> None:
+        _apptainer_on_path.return_value = None
+        venv_base = tmp_path / "venvs"
+        make_venv(venv_base, "my-env")
+        config_path = _make_config(tmp_path, venv_base)
+
+        with pytest.raises(FileNotFoundError, match="module load apptainer"):
+            run_build(venv_name="my-env", config_path=config_path)
+
+        mock_tar.assert_not_called()
 
     @patch("euler_files.apptainer.build._create_tarball")
     @patch("euler_files.apptainer.build.subprocess.run")
     def test_build_failure_cleans_up_tarball(
-        self, mock_run: MagicMock, mock_tar: MagicMock, tmp_path: Path
+        self,
+        mock_run: MagicMock,
+        mock_tar: MagicMock,
+        tmp_path: Path,
+        make_venv: Callable[..., Path],
     ) -> None:
         mock_run.return_value = MagicMock(returncode=1)
-        def fake_tar(venv_path, tar_path):
-            tar_path.write_bytes(b"fake-tar-content")
-        mock_tar.side_effect = fake_tar
+        mock_tar.side_effect = _fake_tar
 
         venv_base = tmp_path / "venvs"
-        _make_venv(venv_base, "my-env")
+        make_venv(venv_base, "my-env")
         config_path = _make_config(tmp_path, venv_base)
 
         with pytest.raises(RuntimeError, match="exit code 1"):
@@ -180,16 +284,102 @@ class TestRunBuild:
 
     @patch("euler_files.apptainer.build._create_tarball")
     @patch("euler_files.apptainer.build.subprocess.run")
-    def test_def_file_references_tarball(
-        self, mock_run: MagicMock, mock_tar: MagicMock, tmp_path: Path
+    def test_failed_rebuild_keeps_existing_sif(
+        self,
+        mock_run: MagicMock,
+        mock_tar: MagicMock,
+        tmp_path: Path,
+        make_venv: Callable[..., Path],
+    ) -> None:
+        def failing_apptainer(cmd, **kwargs):
+            Path(cmd[-2]).write_bytes(b"partial")
+            return MagicMock(returncode=1)
+        mock_run.side_effect = failing_apptainer
+        mock_tar.side_effect = _fake_tar
+
+        venv_base = tmp_path / "venvs"
+        make_venv(venv_base, "my-env")
+        config_path = _make_config(tmp_path, venv_base)
+        sif_store = tmp_path / "sif-store"
+        (sif_store / "my-env.sif").write_bytes(b"existing")
+
+        with pytest.raises(RuntimeError, match="exit code 1"):
+            run_build(venv_name="my-env", force=True, config_path=config_path)
+
+        assert (sif_store / "my-env.sif").read_bytes() == b"existing"
+        assert not Path(mock_run.call_args[0][0][-2]).parent.exists()
+
+    @patch("euler_files.apptainer.build._create_tarball")
+    @patch("euler_files.apptainer.build.subprocess.run")
+    def test_tarball_staged_in_local_tmp(
+        self,
+        mock_run: MagicMock,
+        mock_tar: MagicMock,
+        tmp_path: Path,
+        make_venv: Callable[..., Path],
+    ) -> None:
+        mock_run.side_effect = _fake_apptainer
+        tar_paths = []
+        def fake_tar(venv_path, tar_path):
+            tar_paths.append(tar_path)
+            tar_path.write_bytes(b"fake-tar-content")
+        mock_tar.side_effect = fake_tar
+
+        venv_base = tmp_path / "venvs"
+        make_venv(venv_base, "my-env")
+        config_path = _make_config(tmp_path, venv_base)
+
+        (tmp_path / "local").mkdir()
+        with patch.object(tempfile, "tempdir", str(tmp_path / "local")):
+            run_build(venv_name="my-env", config_path=config_path)
+
+        assert len(tar_paths) == 1
+        assert tar_paths[0].parent.parent == tmp_path / "local"
+        # Staging directory is removed along with the tarball
+        assert not tar_paths[0].parent.exists()
+
+    @patch("euler_files.apptainer.build._create_tarball")
+    @patch("euler_files.apptainer.build.subprocess.run")
+    def test_tarball_falls_back_to_sif_store(
+        self,
+        mock_run: MagicMock,
+        mock_tar: MagicMock,
+        tmp_path: Path,
+        make_venv: Callable[..., Path],
     ) -> None:
-        mock_run.return_value = MagicMock(returncode=0)
+        mock_run.side_effect = _fake_apptainer
+        sif_store = tmp_path / "sif-store"
         def fake_tar(venv_path, tar_path):
+            if tar_path.parent != sif_store:
+                raise RuntimeError("tar failed with exit code 2: No space left on device")
             tar_path.write_bytes(b"fake-tar-content")
         mock_tar.side_effect = fake_tar
 
         venv_base = tmp_path / "venvs"
-        _make_venv(venv_base, "my-env")
+        make_venv(venv_base, "my-env")
+        config_path = _make_config(tmp_path, venv_base)
+
+        run_build(venv_name="my-env", config_path=config_path)
+
+        assert mock_tar.call_count == 2
+        assert mock_tar.call_args[0][1] == sif_store / "my-env.tar"
+        assert "my-env.tar" in (sif_store / "my-env.def").read_text()
+        assert not (sif_store / "my-env.tar").exists()
+
+    @patch("euler_files.apptainer.build._create_tarball")
+    @patch("euler_files.apptainer.build.subprocess.run")
+    def test_def_file_references_tarball(
+        self,
+        mock_run: MagicMock,
+        mock_tar: MagicMock,
+        tmp_path: Path,
+        make_venv: Callable[..., Path],
+    ) -> None:
+        mock_run.side_effect = _fake_apptainer
+        mock_tar.side_effect = _fake_tar
+
+        venv_base = tmp_path / "venvs"
+        make_venv(venv_base, "my-env")
         config_path = _make_config(tmp_path, venv_base)
 
         run_build(venv_name="my-env", config_path=config_path)
@@ -241,7 +431,94 @@ class TestCreateTarball:
             assert any("pyvenv.cfg" in n for n in names)
             assert any("bin/python" in n for n in names)
 
+    def test_tarball_members_owned_by_root(self, tmp_path: Path) -> None:
+        import tarfile
+
+        venv = tmp_path / "venvs" / "my-env"
+        venv.mkdir(parents=True)
+        (venv / "pyvenv.cfg").write_text("version = 3.11\n")
+
+        tar_path = tmp_path / "my-env.tar"
+        _create_tarball(venv, tar_path)
+
+        with tarfile.open(tar_path) as tf:
+            assert all(m.uid == 0 and m.gid == 0 for m in tf.getmembers())
+
     def test_nonexistent_venv_raises(self, tmp_path: Path) -> None:
         tar_path = tmp_path / "out.tar"
         with pytest.raises(RuntimeError, match="tar failed"):
             _create_tarball(tmp_path / "nonexistent", tar_path)
+
+
+class TestInteractiveSelect:
+    @patch("euler_files.apptainer.build._create_tarball")
+    @patch("euler_files.apptainer.build.subprocess.run")
+    def test_selected_venv_cfg_parsed_once(
+        self,
+        mock_run: MagicMock,
+        mock_tar: MagicMock,
+        tmp_path: Path,
+        make_venv: Callable[..., Path],
+    ) -> None:
+        mock_run.side_effect = _fake_apptainer
+        mock_tar.side_effect = _fake_tar
+
+        venv_base = tmp_path / "venvs"
+        make_venv(venv_base, "my-env")
+        config_path = _make_config(tmp_path, venv_base)
+
+        with patch("rich.prompt.Prompt.ask", return_value="1"), \
+                patch(
+                    "euler_files.apptainer.venv.parse_pyvenv_cfg",
+                    wraps=parse_pyvenv_cfg,
+                ) as mock_parse:
+            run_build(config_path=config_path)
+
+        assert mock_parse.call_count == 1
+        assert load_config(config_path).apptainer.images["my-env"].python_version == "3.11.5"
+
+
+class TestVenvContentHash:
+    def test_stable_for_unchanged_venv(
+        self, tmp_path: Path, make_venv: Callable[..., Path]
+    ) -> None:
+        venv = make_venv(tmp_path, "my-env")
+        assert _venv_content_hash(venv) == _venv_content_hash(venv)
+
+    def test_changes_when_file_modified(
+        self, tmp_path: Path, make_venv: Callable[..., Path]
+    ) -> None:
+        venv = make_venv(tmp_path, "my-env")
+        before = _venv_content_hash(venv)
+
+        (venv / "bin" / "python").write_text("#!/usr/bin/env python3.12\n")
+
+        assert _venv_content_hash(venv) != before
+
+    def test_changes_when_symlink_retargeted(
+        self, tmp_path: Path, make_venv: Callable[..., Path]
+    ) -> None:
+        venv = make_venv(tmp_path, "my-env")
+        (venv / "bin" / "python3").symlink_to("python")
+        before = _venv_content_hash(venv)
+
+        (venv / "bin" / "python3").unlink()
+        (venv / "bin" / "python3").symlink_to("/usr/bin/python3")
+
+        assert _venv_content_hash(venv) != before
+
+
+def test_import_does_not_load_rich() -> None:
+    """Importing the apptainer modules shouldn't pay for importing rich."""
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, euler_files.apptainer.build, euler_files.apptainer.prune, "
+        "euler_files.apptainer.wizard; "
+        "print(any(m == 'rich' or m.startswith('rich.') for m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
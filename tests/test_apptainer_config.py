@@ -102,6 +102,15 @@ def test_apptainer_config_defaults() -> None:
     assert apt.images == {}
 
 
+def test_apptainer_paths_expanded(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("VENV_DIR", "/data/venvs")
+    monkeypatch.setenv("HOME", "/home/user")
+    apt = ApptainerConfig(venv_base="$VENV_DIR", sif_store="~/sif", scratch_sif_dir="/scratch/sif")
+    assert apt.venv_base_path() == Path("/data/venvs")
+    assert apt.sif_store_path() == Path("/home/user/sif")
+    assert apt.scratch_sif_path() == Path("/scratch/sif")
+
+
 def test_apptainer_image_config_defaults() -> None:
     img = ApptainerImageConfig(
         venv_name="test",
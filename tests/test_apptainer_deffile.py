@@ -2,6 +2,11 @@
 
 from __future__ import annotations
 
+import os
+import subprocess
+import sys
+from pathlib import Path
+
 from euler_files.apptainer.deffile import generate_def_file
 
 
@@ -71,10 +76,41 @@ class TestGenerateDefFile:
 
         # Check that path fixup commands are present
         assert "pyvenv.cfg" in result
-        assert "sed -i" in result
+        assert "<<'PY'" in result
+        assert "sed -i" not in result
         assert "ln -sf" in result
         assert "PYTHON_MM=" in result
 
+    def test_post_fixup_script_rewrites_venv(self, tmp_path: Path) -> None:
+        """The embedded fixup script rewrites cfg, shebangs and activate."""
+        result = generate_def_file(
+            venv_name="test",
+            tar_path="/path/to/test.tar",
+            python_version="3.11.5",
+        )
+        script = result.split("<<'PY'\n", 1)[1].split("\nPY\n", 1)[0]
+
+        venv = tmp_path / "venv"
+        (venv / "bin").mkdir(parents=True)
+        (venv / "pyvenv.cfg").write_text("home = /old/bin\nversion = 3.11.5\n")
+        (venv / "bin" / "pip").write_text("#!/old/venv/bin/python3.11\nimport pip\n")
+        (venv / "bin" / "activate").write_text("VIRTUAL_ENV='/old/venv'\nexport VIRTUAL_ENV\n")
+        untouched = venv / "bin" / "data"
+        untouched.write_bytes(b"\x00binary")
+        mtime_before = untouched.stat().st_mtime_ns
+
+        env = {
+            **os.environ,
+            "CONTAINER_VENV": str(venv),
+            "SYSTEM_PYTHON": "/usr/local/bin/python3.11",
+        }
+        subprocess.run([sys.executable, "-"], input=script, text=True, env=env, check=True)
+
+        assert (venv / "pyvenv.cfg").read_text().startswith("home = /usr/local/bin\n")
+        assert (venv / "bin" / "pip").read_text() == f"#!{venv}/bin/python\nimport pip\n"
+        assert (venv / "bin" / "activate").read_text().startswith(f'VIRTUAL_ENV="{venv}"\n')
+        assert untouched.stat().st_mtime_ns == mtime_before
+
     def test_environment_section(self) -> None:
         result = generate_def_file(
             venv_name="test",
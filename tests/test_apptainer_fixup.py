@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
+from typing import Callable
 
 import pytest
 
@@ -10,31 +12,6 @@ from euler_files.config import ApptainerConfig, EulerFilesConfig, save_config
 from euler_files.apptainer.fixup import fixup_venv, run_fixup, _detect_old_path
 
 
-def _make_venv(base: Path, name: str, virtual_env_path: str = None) -> Path:
-    """Create a venv with paths pointing to virtual_env_path (defaults to actual)."""
-    venv = base / name
-    venv.mkdir(parents=True)
-    (venv / "pyvenv.cfg").write_text("home = /usr/bin\nversion_info = 3.11.5\n")
-    bin_dir = venv / "bin"
-    bin_dir.mkdir()
-
-    path_in_scripts = virtual_env_path or str(venv)
-    (bin_dir / "activate").write_text(
-        f'VIRTUAL_ENV="{path_in_scripts}"\n'
-        f'export VIRTUAL_ENV\n'
-        f'PATH="$VIRTUAL_ENV/bin:$PATH"\n'
-    )
-    (bin_dir / "pip").write_text(
-        f"#!{path_in_scripts}/bin/python\nimport sys\nsys.exit(0)\n"
-    )
-    (bin_dir / "uv").write_text(
-        f"#!{path_in_scripts}/bin/python3\nimport uv\n"
-    )
-    (bin_dir / "python").write_text("#!/usr/bin/env python3\n")
-    (bin_dir / "data.bin").write_bytes(b"\x00\x01\x02")
-    return venv
-
-
 class TestDetectOldPath:
     def test_double_quoted(self, tmp_path: Path) -> None:
         f = tmp_path / "activate"
@@ -51,6 +28,26 @@ class TestDetectOldPath:
         f.write_text("VIRTUAL_ENV=/old/path/venvs/myenv\n")
         assert _detect_old_path(f) == "/old/path/venvs/myenv"
 
+    def test_skips_cygpath_branch(self, tmp_path: Path) -> None:
+        f = tmp_path / "activate"
+        f.write_text(
+            'case "$(uname)" in\n'
+            "    CYGWIN*)\n"
+            "        VIRTUAL_ENV=$(cygpath '/old/path/venvs/myenv')\n"
+            "        ;;\n"
+            "    *)\n"
+            "        export VIRTUAL_ENV='/old/path/venvs/myenv'\n"
+            "        ;;\n"
+            "esac\n"
+        )
+        assert _detect_old_path(f) == "/old/path/venvs/myenv"
+
+    def test_match_past_first_block(self, tmp_path: Path) -> None:
+        f = tmp_path / "activate"
+        padding = "#" * 4090 + "\n"
+        f.write_text(padding + 'VIRTUAL_ENV="/old/path/venvs/myenv"\n')
+        assert _detect_old_path(f) == "/old/path/venvs/myenv"
+
     def test_no_match(self, tmp_path: Path) -> None:
         f = tmp_path / "activate"
         f.write_text("# no VIRTUAL_ENV here\n")
@@ -59,10 +56,17 @@ class TestDetectOldPath:
     def test_missing_file(self, tmp_path: Path) -> None:
         assert _detect_old_path(tmp_path / "nonexistent") is None
 
+    def test_non_utf8_path(self, tmp_path: Path) -> None:
+        f = tmp_path / "activate"
+        f.write_bytes(b'VIRTUAL_ENV="/old/\xe9t\xe9/myenv"\n')
+        old = _detect_old_path(f)
+        assert old is not None
+        assert os.fsencode(old) == b"/old/\xe9t\xe9/myenv"
+
 
 class TestFixupVenv:
-    def test_fixes_broken_venv(self, tmp_path: Path) -> None:
-        venv = _make_venv(tmp_path, "myenv", virtual_env_path="/old/venvs/myenv")
+    def test_fixes_broken_venv(self, tmp_path: Path, make_venv: Callable[..., Path]) -> None:
+        venv = make_venv(tmp_path, "myenv", virtual_env_path="/old/venvs/myenv")
 
         fixed = fixup_venv(venv)
 
@@ -71,8 +75,8 @@ class TestFixupVenv:
         assert str(venv) in activate
         assert "/old/venvs/myenv" not in activate
 
-    def test_fixes_shebangs(self, tmp_path: Path) -> None:
-        venv = _make_venv(tmp_path, "myenv", virtual_env_path="/old/venvs/myenv")
+    def test_fixes_shebangs(self, tmp_path: Path, make_venv: Callable[..., Path]) -> None:
+        venv = make_venv(tmp_path, "myenv", virtual_env_path="/old/venvs/myenv")
 
         fixup_venv(venv)
 
@@ -83,18 +87,18 @@ class TestFixupVenv:
         uv = (venv / "bin" / "uv").read_text()
         assert uv.startswith(f"#!{venv}/bin/python3\n")
 
-    def test_skips_correct_venv(self, tmp_path: Path) -> None:
-        venv = _make_venv(tmp_path, "myenv")  # paths already correct
+    def test_skips_correct_venv(self, tmp_path: Path, make_venv: Callable[..., Path]) -> None:
+        venv = make_venv(tmp_path, "myenv")  # paths already correct
         fixed = fixup_venv(venv)
         assert fixed == 0
 
-    def test_skips_binary_files(self, tmp_path: Path) -> None:
-        venv = _make_venv(tmp_path, "myenv", virtual_env_path="/old/venvs/myenv")
+    def test_skips_binary_files(self, tmp_path: Path, make_venv: Callable[..., Path]) -> None:
+        venv = make_venv(tmp_path, "myenv", virtual_env_path="/old/venvs/myenv")
         fixup_venv(venv)
         assert (venv / "bin" / "data.bin").read_bytes() == b"\x00\x01\x02"
 
-    def test_dry_run(self, tmp_path: Path) -> None:
-        venv = _make_venv(tmp_path, "myenv", virtual_env_path="/old/venvs/myenv")
+    def test_dry_run(self, tmp_path: Path, make_venv: Callable[..., Path]) -> None:
+        venv = make_venv(tmp_path, "myenv", virtual_env_path="/old/venvs/myenv")
 
         fixed = fixup_venv(venv, dry_run=True)
 
@@ -103,13 +107,47 @@ class TestFixupVenv:
         activate = (venv / "bin" / "activate").read_text()
         assert "/old/venvs/myenv" in activate
 
-    def test_preserves_script_body(self, tmp_path: Path) -> None:
-        venv = _make_venv(tmp_path, "myenv", virtual_env_path="/old/venvs/myenv")
+    def test_preserves_script_body(self, tmp_path: Path, make_venv: Callable[..., Path]) -> None:
+        venv = make_venv(tmp_path, "myenv", virtual_env_path="/old/venvs/myenv")
         fixup_venv(venv)
         pip = (venv / "bin" / "pip").read_text()
         assert "import sys" in pip
         assert "sys.exit(0)" in pip
 
+    def test_preserves_non_utf8_body(
+        self, tmp_path: Path, make_venv: Callable[..., Path]
+    ) -> None:
+        venv = make_venv(tmp_path, "myenv", virtual_env_path="/old/myenv")
+        (venv / "bin" / "tool").write_bytes(b"#!/old/myenv/bin/python\n# \xff\xfe\n")
+        fixup_venv(venv)
+        data = (venv / "bin" / "tool").read_bytes()
+        assert data == f"#!{venv}/bin/python\n".encode() + b"# \xff\xfe\n"
+
+    def test_same_length_path_rewritten_in_place(
+        self, tmp_path: Path, make_venv: Callable[..., Path]
+    ) -> None:
+        venv = make_venv(tmp_path, "myenv")
+        old = "/" + "x" * (len(str(venv)) - 1)
+        script = venv / "bin" / "tool"
+        script.write_text(f"#!{old}/bin/python\nimport tool\n")
+        (venv / "bin" / "activate").write_text(f'VIRTUAL_ENV="{old}"\n')
+        inode = script.stat().st_ino
+
+        fixup_venv(venv)
+
+        assert script.read_text() == f"#!{venv}/bin/python\nimport tool\n"
+        assert script.stat().st_ino == inode
+
+    def test_does_not_follow_symlinks(
+        self, tmp_path: Path, make_venv: Callable[..., Path]
+    ) -> None:
+        outside = tmp_path / "outside-script"
+        outside.write_text("#!/old/myenv/bin/python\n")
+        venv = make_venv(tmp_path, "myenv", virtual_env_path="/old/myenv")
+        (venv / "bin" / "linked").symlink_to(outside)
+        fixup_venv(venv)
+        assert outside.read_text() == "#!/old/myenv/bin/python\n"
+
     def test_no_activate(self, tmp_path: Path) -> None:
         """Venv without activate script is skipped gracefully."""
         venv = tmp_path / "noactivate"
@@ -130,10 +168,10 @@ class TestRunFixup:
         save_config(config, path=config_path)
         return config_path
 
-    def test_fixes_all_venvs(self, tmp_path: Path) -> None:
+    def test_fixes_all_venvs(self, tmp_path: Path, make_venv: Callable[..., Path]) -> None:
         venv_base = tmp_path / "venvs"
-        _make_venv(venv_base, "env1", virtual_env_path="/old/env1")
-        _make_venv(venv_base, "env2", virtual_env_path="/old/env2")
+        make_venv(venv_base, "env1", virtual_env_path="/old/env1")
+        make_venv(venv_base, "env2", virtual_env_path="/old/env2")
         config_path = self._make_config(tmp_path, venv_base)
 
         run_fixup(config_path=config_path)
@@ -143,10 +181,10 @@ class TestRunFixup:
             assert str(venv_base / name) in activate
             assert "/old/" not in activate
 
-    def test_fixes_single_venv(self, tmp_path: Path) -> None:
+    def test_fixes_single_venv(self, tmp_path: Path, make_venv: Callable[..., Path]) -> None:
         venv_base = tmp_path / "venvs"
-        _make_venv(venv_base, "env1", virtual_env_path="/old/env1")
-        _make_venv(venv_base, "env2", virtual_env_path="/old/env2")
+        make_venv(venv_base, "env1", virtual_env_path="/old/env1")
+        make_venv(venv_base, "env2", virtual_env_path="/old/env2")
         config_path = self._make_config(tmp_path, venv_base)
 
         run_fixup(venv_name="env1", config_path=config_path)
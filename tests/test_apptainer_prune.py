@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import os
 import time
 from pathlib import Path
 from unittest.mock import patch, MagicMock
@@ -15,7 +16,13 @@ from euler_files.config import (
     load_config,
     save_config,
 )
-from euler_files.apptainer.prune import run_prune, PruneMode
+from euler_files.apptainer.prune import (
+    run_prune,
+    PruneMode,
+    _interactive_select,
+    _parallel_rmtree,
+    _rmtree,
+)
 
 
 def _make_env(
@@ -40,8 +47,7 @@ def _make_env(
         (venv / "pyvenv.cfg").write_text("version_info = 3.11.5\n")
         (venv / "bin").mkdir(exist_ok=True)
         (venv / "bin" / "python").write_text("#!/usr/bin/env python3\n")
-        (venv / "lib").mkdir(exist_ok=True)
-        (venv / "lib" / "site-packages").mkdir(exist_ok=True)
+        (venv / "lib" / "site-packages").mkdir(parents=True, exist_ok=True)
         (venv / "lib" / "site-packages" / "torch.py").write_text("# big package\n")
 
     if create_sif:
@@ -217,6 +223,22 @@ class TestRunPrune:
         loaded = load_config(path=config_path)
         assert "my-env" in loaded.apptainer.images
 
+    def test_prune_symlinked_venv_keeps_target(self, tmp_path: Path) -> None:
+        config_path = _make_env(tmp_path, create_venv=False)
+        real = tmp_path / "elsewhere" / "my-env"
+        (real / "bin").mkdir(parents=True)
+        (real / "pyvenv.cfg").write_text("version_info = 3.11.5\n")
+        link = tmp_path / "venvs" / "my-env"
+        link.symlink_to(real)
+
+        run_prune(
+            image_name="my-env", mode=PruneMode.VENV_ONLY,
+            yes=True, config_path=config_path,
+        )
+
+        assert not os.path.lexists(link)
+        assert (real / "pyvenv.cfg").read_text() == "version_info = 3.11.5\n"
+
     def test_prune_venv_with_many_files(self, tmp_path: Path) -> None:
         """Ensure shutil.rmtree handles deep venv directories."""
         config_path = _make_env(tmp_path)
@@ -234,3 +256,107 @@ class TestRunPrune:
         )
 
         assert not venv.exists()
+
+
+class TestInteractiveSelect:
+    def test_lists_config_and_filesystem_entries(self, tmp_path: Path) -> None:
+        config = load_config(_make_env(tmp_path, name="alpha"))
+        _make_env(tmp_path, name="beta", create_sif=False, add_to_config=False)
+        (tmp_path / "venvs" / "not-a-venv").mkdir()
+
+        with patch("rich.prompt.Prompt.ask", return_value="2"):
+            choice = _interactive_select(
+                config.apptainer, tmp_path / "venvs", tmp_path / "sif-store"
+            )
+
+        assert choice == "beta"
+
+
+class TestParallelRmtree:
+    def test_removes_deep_tree(self, tmp_path: Path) -> None:
+        root = tmp_path / "venv"
+        site = root / "lib" / "python3.11" / "site-packages"
+        for i in range(20):
+            pkg = site / f"pkg{i}" / "sub"
+            pkg.mkdir(parents=True)
+            (pkg / "mod.py").write_text("x = 1\n")
+        (root / "bin").mkdir()
+        (root / "bin" / "python").write_text("#!/usr/bin/env python3\n")
+        (root / "pyvenv.cfg").write_text("version_info = 3.11.5\n")
+
+        _parallel_rmtree(root, workers=4)
+
+        assert not root.exists()
+
+    def test_does_not_follow_symlinks(self, tmp_path: Path) -> None:
+        outside = tmp_path / "outside"
+        outside.mkdir()
+        (outside / "keep.txt").write_text("keep")
+        root = tmp_path / "venv"
+        (root / "lib").mkdir(parents=True)
+        (root / "lib" / "link").symlink_to(outside)
+
+        _parallel_rmtree(root)
+
+        assert not root.exists()
+        assert (outside / "keep.txt").read_text() == "keep"
+
+    def test_symlinked_root_removes_only_the_link(self, tmp_path: Path) -> None:
+        outside = tmp_path / "outside"
+        (outside / "lib").mkdir(parents=True)
+        (outside / "lib" / "keep.py").write_text("keep")
+        root = tmp_path / "venv"
+        root.symlink_to(outside)
+
+        _parallel_rmtree(root)
+
+        assert not os.path.lexists(root)
+        assert (outside / "lib" / "keep.py").read_text() == "keep"
+
+    def test_read_only_directory(self, tmp_path: Path) -> None:
+        root = tmp_path / "venv"
+        locked = root / "lib" / "locked"
+        locked.mkdir(parents=True)
+        (locked / "f.py").write_text("x = 1\n")
+        locked.chmod(0o555)
+
+        _parallel_rmtree(root)
+
+        assert not root.exists()
+
+
+class TestRmtree:
+    def test_uses_system_rm(self, tmp_path: Path) -> None:
+        root = tmp_path / "venv"
+        root.mkdir()
+
+        with patch("euler_files.apptainer.prune._which", return_value="/bin/rm"), \
+                patch("euler_files.apptainer.prune.subprocess.run") as mock_run, \
+                patch("euler_files.apptainer.prune.shutil.rmtree") as mock_rmtree:
+            mock_run.side_effect = lambda cmd, **kwargs: os.rmdir(cmd[-1])
+            _rmtree(str(root))
+
+        assert mock_run.call_args[0][0] == ["/bin/rm", "-rf", "--", str(root)]
+        mock_rmtree.assert_not_called()
+        assert not root.exists()
+
+    def test_falls_back_when_rm_leaves_files(self, tmp_path: Path) -> None:
+        root = tmp_path / "venv"
+        (root / "lib").mkdir(parents=True)
+        (root / "lib" / "f.py").write_text("x = 1\n")
+
+        with patch("euler_files.apptainer.prune._which", return_value="/bin/rm"), \
+                patch("euler_files.apptainer.prune.subprocess.run") as mock_run:
+            mock_run.return_value = MagicMock(returncode=1)
+            _rmtree(str(root))
+
+        assert not root.exists()
+
+    def test_without_rm(self, tmp_path: Path) -> None:
+        root = tmp_path / "venv"
+        (root / "lib").mkdir(parents=True)
+
+        with patch("euler_files.apptainer.prune._which", return_value=None):
+            _rmtree(str(root))
+
+        assert not root.exists()
@@ -97,13 +97,59 @@ class TestRunApptainerSync:
         target.write_bytes(b"sif-content")
 
         # Make target mtime >= source mtime
-        source_mtime = (sif_store / "my-env.sif").stat().st_mtime
-        os.utime(str(target), (source_mtime + 1, source_mtime + 1))
+        later = (sif_store / "my-env.sif").stat().st_mtime_ns + 1_000_000_000
+        os.utime(target, ns=(later, later))
 
         run_apptainer_sync(config_path=config_path)
 
         mock_rsync.assert_not_called()
 
+    @patch("euler_files.apptainer.sync.rsync_file")
+    def test_skip_with_truncated_target_mtime(
+        self, mock_rsync: MagicMock, tmp_path: Path
+    ) -> None:
+        """A target whose mtime was rounded down by the filesystem is still current."""
+        config_path = _make_config(tmp_path, images={
+            "my-env": ApptainerImageConfig(
+                venv_name="my-env",
+                python_version="3.11.5",
+                sif_filename="my-env.sif",
+            ),
+        })
+        source = tmp_path / "sif-store" / "my-env.sif"
+        source.write_bytes(b"sif-content")
+        os.utime(source, ns=(1_700_000_000_600_000_000, 1_700_000_000_600_000_000))
+
+        target = tmp_path / "scratch" / "sif" / "my-env.sif"
+        target.parent.mkdir(parents=True)
+        target.write_bytes(b"sif-content")
+        os.utime(target, ns=(1_700_000_000_000_000_000, 1_700_000_000_000_000_000))
+
+        run_apptainer_sync(config_path=config_path)
+
+        mock_rsync.assert_not_called()
+
+    @patch("euler_files.apptainer.sync.rsync_file")
+    def test_size_mismatch_resyncs(self, mock_rsync: MagicMock, tmp_path: Path) -> None:
+        config_path = _make_config(tmp_path, images={
+            "my-env": ApptainerImageConfig(
+                venv_name="my-env",
+                python_version="3.11.5",
+                sif_filename="my-env.sif",
+            ),
+        })
+        (tmp_path / "sif-store" / "my-env.sif").write_bytes(b"new-sif-content")
+
+        target = tmp_path / "scratch" / "sif" / "my-env.sif"
+        target.parent.mkdir(parents=True)
+        target.write_bytes(b"old")
+        future = time.time() + 60
+        os.utime(target, (future, future))
+
+        run_apptainer_sync(config_path=config_path)
+
+        mock_rsync.assert_called_once()
+
     @patch("euler_files.apptainer.sync.rsync_file")
     def test_force_overrides_skip(self, mock_rsync: MagicMock, tmp_path: Path) -> None:
         config_path = _make_config(tmp_path, images={
@@ -123,8 +169,8 @@ class TestRunApptainerSync:
         scratch_sif.mkdir(parents=True)
         target = scratch_sif / "my-env.sif"
         target.write_bytes(b"sif-content")
-        source_mtime = (sif_store / "my-env.sif").stat().st_mtime
-        os.utime(str(target), (source_mtime + 1, source_mtime + 1))
+        later = (sif_store / "my-env.sif").stat().st_mtime_ns + 1_000_000_000
+        os.utime(target, ns=(later, later))
 
         run_apptainer_sync(force=True, config_path=config_path)
 
@@ -175,6 +221,24 @@ class TestRunApptainerSync:
         call_kwargs = mock_rsync.call_args
         assert "env-a.sif" in str(call_kwargs.kwargs["source"])
 
+    @patch("euler_files.apptainer.sync.rsync_file")
+    def test_only_images_ignores_unknown_and_repeated_names(
+        self, mock_rsync: MagicMock, tmp_path: Path
+    ) -> None:
+        config_path = _make_config(tmp_path, images={
+            "env-a": ApptainerImageConfig(
+                venv_name="env-a",
+                python_version="3.11.5",
+                sif_filename="env-a.sif",
+                built_at=time.time(),
+            ),
+        })
+        (tmp_path / "sif-store" / "env-a.sif").write_bytes(b"a")
+
+        run_apptainer_sync(only_images=["env-a", "nope", "env-a"], config_path=config_path)
+
+        assert mock_rsync.call_count == 1
+
     @patch("euler_files.apptainer.sync.rsync_file")
     def test_skip_missing_source(self, mock_rsync: MagicMock, tmp_path: Path) -> None:
         config_path = _make_config(tmp_path, images={
@@ -208,3 +272,29 @@ class TestRunApptainerSync:
         run_apptainer_sync(config_path=config_path)
 
         mock_rsync.assert_not_called()
+
+    @patch("euler_files.apptainer.sync.rsync_file")
+    def test_one_failure_does_not_stop_others(
+        self, mock_rsync: MagicMock, tmp_path: Path
+    ) -> None:
+        images = {
+            name: ApptainerImageConfig(
+                venv_name=name, python_version="3.11.5", sif_filename=f"{name}.sif"
+            )
+            for name in ("env-a", "env-b", "env-c")
+        }
+        config_path = _make_config(tmp_path, images=images)
+        for name in images:
+            (tmp_path / "sif-store" / f"{name}.sif").write_bytes(b"sif")
+
+        def fake_rsync(source, target, **kwargs):
+            if source.name == "env-b.sif":
+                raise RuntimeError("rsync exploded")
+        mock_rsync.side_effect = fake_rsync
+
+        with pytest.raises(SystemExit) as exc_info:
+            run_apptainer_sync(config_path=config_path)
+
+        assert exc_info.value.code == 1
+        synced = sorted(c.kwargs["source"].name for c in mock_rsync.call_args_list)
+        assert synced == ["env-a.sif", "env-b.sif", "env-c.sif"]
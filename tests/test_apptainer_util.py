@@ -0,0 +1,45 @@
+"""Tests for shared apptainer helpers."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from euler_files.apptainer._util import _interactive_pick, _which, _which_cached
+
+
+class TestInteractivePick:
+    def test_pick_by_number(self) -> None:
+        with patch("rich.prompt.Prompt.ask", return_value="2"):
+            idx = _interactive_pick("T", ["a", "b"], ["X"], [("1",), ("2",)], "Pick", "thing")
+        assert idx == 1
+
+    def test_pick_by_name(self) -> None:
+        with patch("rich.prompt.Prompt.ask", return_value="a"):
+            idx = _interactive_pick("T", ["a", "b"], ["X"], [("1",), ("2",)], "Pick", "thing")
+        assert idx == 0
+
+    def test_unknown_choice(self, capsys: pytest.CaptureFixture[str]) -> None:
+        with patch("rich.prompt.Prompt.ask", return_value="9"):
+            idx = _interactive_pick("T", ["a", "b"], ["X"], [("1",), ("2",)], "Pick", "thing")
+        assert idx is None
+        assert "Unknown thing: 9" in capsys.readouterr().err
+
+
+class TestWhich:
+    def test_cached_per_path(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        _which_cached.cache_clear()
+        tool = tmp_path / "bin" / "apptainer"
+        tool.parent.mkdir()
+        tool.write_text("#!/bin/sh\n")
+        tool.chmod(0o755)
+
+        monkeypatch.setenv("PATH", str(tool.parent))
+        assert _which("apptainer") == str(tool)
+        with patch("shutil.which", side_effect=AssertionError("PATH re-walked")):
+            assert _which("apptainer") == str(tool)
+
+        monkeypatch.setenv("PATH", str(tmp_path))
+        assert _which("apptainer") is None
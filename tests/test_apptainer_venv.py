@@ -2,7 +2,9 @@
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -51,6 +53,25 @@ class TestParsePyvenvCfg:
         with pytest.raises(ValueError, match="No pyvenv.cfg"):
             parse_pyvenv_cfg(tmp_path / "nonexistent")
 
+    def test_repeated_parse_is_cached(self, tmp_path: Path) -> None:
+        venv = _create_venv(tmp_path, "test", "version_info = 3.11.5\n")
+        parse_pyvenv_cfg(venv)
+
+        with patch.object(Path, "read_bytes", side_effect=AssertionError("re-read")):
+            assert parse_pyvenv_cfg(venv)["version_info"] == "3.11.5"
+
+    def test_cache_invalidated_on_change(self, tmp_path: Path) -> None:
+        venv = _create_venv(tmp_path, "test", "version_info = 3.11.5\n")
+        assert parse_pyvenv_cfg(venv)["version_info"] == "3.11.5"
+
+        (venv / "pyvenv.cfg").write_text("version_info = 3.12.10\n")
+        assert parse_pyvenv_cfg(venv)["version_info"] == "3.12.10"
+
+    def test_returned_dict_is_a_copy(self, tmp_path: Path) -> None:
+        venv = _create_venv(tmp_path, "test", "version_info = 3.11.5\n")
+        parse_pyvenv_cfg(venv)["version_info"] = "mutated"
+        assert parse_pyvenv_cfg(venv)["version_info"] == "3.11.5"
+
     def test_empty_lines_and_comments(self, tmp_path: Path) -> None:
         venv = _create_venv(tmp_path, "test", (
             "# comment\n"
@@ -64,6 +85,14 @@ class TestParsePyvenvCfg:
         assert cfg["version_info"] == "3.10.0"
         assert len(cfg) == 2
 
+    def test_non_utf8_value_and_crlf(self, tmp_path: Path) -> None:
+        venv = tmp_path / "test"
+        venv.mkdir()
+        (venv / "pyvenv.cfg").write_bytes(b"home = /opt/\xe9t\xe9/bin\r\nversion_info = 3.11.5\r\n")
+        cfg = parse_pyvenv_cfg(venv)
+        assert cfg["home"] == os.fsdecode(b"/opt/\xe9t\xe9/bin")
+        assert cfg["version_info"] == "3.11.5"
+
 
 class TestDetectPythonVersion:
     def test_uv_version_info(self, tmp_path: Path) -> None:
@@ -128,6 +157,15 @@ class TestListVenvs:
         assert venvs[1].python_version == "3.12.0"
         assert venvs[1].python_major_minor == "3.12"
 
+    def test_many_venvs_keep_name_order(self, tmp_path: Path) -> None:
+        names = [f"env-{i:02d}" for i in range(40)]
+        for name in reversed(names):
+            _create_venv(tmp_path, name, "version_info = 3.11.5\n")
+        (tmp_path / "env-05" / "pyvenv.cfg").write_text("home = /usr/bin\n")
+
+        venvs = list_venvs(tmp_path)
+        assert [v.name for v in venvs] == [n for n in names if n != "env-05"]
+
     def test_nonexistent_base(self, tmp_path: Path) -> None:
         venvs = list_venvs(tmp_path / "nonexistent")
         assert venvs == []
@@ -145,3 +183,18 @@ class TestListVenvs:
 
         venvs = list_venvs(tmp_path)
         assert venvs == []
+
+    def test_follows_symlinked_venv(self, tmp_path: Path) -> None:
+        real = _create_venv(tmp_path / "elsewhere", "real-env", "version_info = 3.11.5\n")
+        base = tmp_path / "venvs"
+        base.mkdir()
+        (base / "linked-env").symlink_to(real)
+
+        venvs = list_venvs(base)
+        assert [v.name for v in venvs] == ["linked-env"]
+        assert venvs[0].path == base / "linked-env"
+
+    def test_base_is_a_file(self, tmp_path: Path) -> None:
+        base = tmp_path / "file"
+        base.write_text("hi")
+        assert list_venvs(base) == []
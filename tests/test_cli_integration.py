@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from unittest.mock import MagicMock
 
 import pytest
 from click.testing import CliRunner
@@ -12,6 +12,16 @@ from euler_files.cli import main
 from euler_files.config import EulerFilesConfig, VarConfig, save_config
 
 
+@pytest.fixture(scope="module")
+def runner() -> CliRunner:
+    """One CliRunner for the module; invoke() sets up fresh buffers each call.
+
+    Tests pass catch_exceptions=False so an unexpected error fails with its
+    own traceback instead of a bare exit_code mismatch.
+    """
+    return CliRunner()
+
+
 @pytest.fixture
 def cli_config(tmp_path: Path, tmp_scratch: Path, tmp_source: Path) -> Path:
     config = EulerFilesConfig(
@@ -26,67 +36,62 @@ def cli_config(tmp_path: Path, tmp_scratch: Path, tmp_source: Path) -> Path:
     return config_path
 
 
-def test_version() -> None:
-    runner = CliRunner()
-    result = runner.invoke(main, ["--version"])
+def test_version(runner: CliRunner) -> None:
+    result = runner.invoke(main, ["--version"], catch_exceptions=False)
     assert result.exit_code == 0
     assert "0.1.0" in result.output
 
 
-def test_sync_no_config() -> None:
-    runner = CliRunner()
-    with patch("euler_files.config.CONFIG_PATH", Path("/nonexistent/config.json")):
-        result = runner.invoke(main, ["sync"])
+def test_sync_no_config(runner: CliRunner, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("euler_files.config.CONFIG_PATH", Path("/nonexistent/config.json"))
+    result = runner.invoke(main, ["sync"], catch_exceptions=False)
     assert result.exit_code == 2
     assert "euler-files init" in result.output
 
 
-def test_sync_with_config(cli_config: Path) -> None:
-    runner = CliRunner()
-    with (
-        patch("euler_files.config.CONFIG_PATH", cli_config),
-        patch("euler_files.rsync.subprocess.run") as mock_rsync,
-    ):
-        mock_rsync.return_value = MagicMock(returncode=0)
-        result = runner.invoke(main, ["sync"])
+def test_sync_with_config(
+    runner: CliRunner, cli_config: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr("euler_files.config.CONFIG_PATH", cli_config)
+    monkeypatch.setattr(
+        "euler_files.rsync.subprocess.run", MagicMock(return_value=MagicMock(returncode=0))
+    )
+    result = runner.invoke(main, ["sync"], catch_exceptions=False)
 
     assert result.exit_code == 0
     assert "export HF_HOME=" in result.output
 
 
-def test_sync_dry_run(cli_config: Path) -> None:
-    runner = CliRunner()
-    with patch("euler_files.config.CONFIG_PATH", cli_config):
-        result = runner.invoke(main, ["sync", "--dry-run"])
+def test_sync_dry_run(
+    runner: CliRunner, cli_config: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr("euler_files.config.CONFIG_PATH", cli_config)
+    result = runner.invoke(main, ["sync", "--dry-run"], catch_exceptions=False)
 
     assert result.exit_code == 0
     assert "export HF_HOME=" in result.output
 
 
-def test_shell_init_bash() -> None:
-    runner = CliRunner()
-    result = runner.invoke(main, ["shell-init"])
+def test_shell_init_bash(runner: CliRunner) -> None:
+    result = runner.invoke(main, ["shell-init"], catch_exceptions=False)
     assert result.exit_code == 0
     assert "ef()" in result.output
     assert "eval" in result.output
 
 
-def test_shell_init_fish() -> None:
-    runner = CliRunner()
-    result = runner.invoke(main, ["shell-init", "--shell", "fish"])
+def test_shell_init_fish(runner: CliRunner) -> None:
+    result = runner.invoke(main, ["shell-init", "--shell", "fish"], catch_exceptions=False)
     assert result.exit_code == 0
     assert "function ef" in result.output
 
 
-def test_status_no_config() -> None:
-    runner = CliRunner()
-    with patch("euler_files.config.CONFIG_PATH", Path("/nonexistent/config.json")):
-        result = runner.invoke(main, ["status"])
+def test_status_no_config(runner: CliRunner, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("euler_files.config.CONFIG_PATH", Path("/nonexistent/config.json"))
+    result = runner.invoke(main, ["status"], catch_exceptions=False)
     assert result.exit_code == 2
 
 
-def test_push_no_config() -> None:
-    runner = CliRunner()
-    with patch("euler_files.config.CONFIG_PATH", Path("/nonexistent/config.json")):
-        result = runner.invoke(main, ["push"])
+def test_push_no_config(runner: CliRunner, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("euler_files.config.CONFIG_PATH", Path("/nonexistent/config.json"))
+    result = runner.invoke(main, ["push"], catch_exceptions=False)
     assert result.exit_code == 2
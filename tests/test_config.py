@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import dataclasses
 import json
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -54,6 +56,75 @@ def test_load_version_mismatch(tmp_path: Path) -> None:
         load_config(path=config_path)
 
 
+def test_load_fills_optional_fields(tmp_path: Path) -> None:
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({
+        "version": CONFIG_VERSION,
+        "vars": {"HF_HOME": {"source": "/home/user/.cache/hf"}},
+        "migrations": [
+            {"old_path": "/a", "new_path": "/b", "migrated_at": 1.0, "field_name": "sif_store"},
+        ],
+    }))
+
+    loaded = load_config(path=config_path)
+    assert loaded.vars["HF_HOME"] == VarConfig(source="/home/user/.cache/hf", enabled=True)
+    assert loaded.migrations[0].var_name == ""
+
+
+def test_repeated_load_reuses_parsed_file(tmp_path: Path) -> None:
+    config_path = tmp_path / "config.json"
+    save_config(EulerFilesConfig(scratch_base="/scratch/user"), path=config_path)
+    load_config(path=config_path)
+
+    with patch.object(Path, "read_bytes", side_effect=AssertionError("re-read")):
+        assert load_config(path=config_path).scratch_base == "/scratch/user"
+
+
+def test_load_sees_external_edit(tmp_path: Path) -> None:
+    config_path = tmp_path / "config.json"
+    save_config(EulerFilesConfig(scratch_base="/scratch/a"), path=config_path)
+    assert load_config(path=config_path).scratch_base == "/scratch/a"
+
+    raw = json.loads(config_path.read_text())
+    raw["scratch_base"] = "/scratch/bb"
+    config_path.write_text(json.dumps(raw))
+
+    assert load_config(path=config_path).scratch_base == "/scratch/bb"
+
+
+def test_loaded_config_is_independent(tmp_path: Path) -> None:
+    config_path = tmp_path / "config.json"
+    save_config(EulerFilesConfig(scratch_base="/scratch/user"), path=config_path)
+
+    first = load_config(path=config_path)
+    first.rsync_extra_args.append("--bwlimit=1")
+    first.vars["HF_HOME"] = VarConfig(source="/x")
+
+    second = load_config(path=config_path)
+    assert second.rsync_extra_args == []
+    assert second.vars == {}
+
+
+def test_saving_unchanged_config_skips_write(tmp_path: Path) -> None:
+    config_path = tmp_path / "config.json"
+    config = EulerFilesConfig(scratch_base="/scratch/user")
+    save_config(config, path=config_path)
+
+    with patch("euler_files.config.atomic_write", side_effect=AssertionError("rewritten")):
+        save_config(config, path=config_path)
+
+    config.parallel_jobs = 8
+    save_config(config, path=config_path)
+    assert load_config(path=config_path).parallel_jobs == 8
+
+
+def test_leaf_records_are_frozen() -> None:
+    var = VarConfig(source="/x")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        var.source = "/y"  # type: ignore[misc]
+    assert hash(var) == hash(VarConfig(source="/x"))
+
+
 def test_scratch_dir_for() -> None:
     config = EulerFilesConfig(
         scratch_base="/scratch/user",
@@ -79,6 +150,14 @@ def test_lock_path_for() -> None:
     assert config.lock_path_for("X") == Path("/scratch/user/.cache/euler-files/.X.lock")
 
 
+def test_path_helpers_follow_scratch_base_changes() -> None:
+    config = EulerFilesConfig(scratch_base="/scratch/a")
+    assert config.scratch_dir_for("X") is config.scratch_dir_for("X")
+
+    config.scratch_base = "/scratch/b"
+    assert config.scratch_dir_for("X") == Path("/scratch/b/.cache/euler-files/X")
+
+
 def test_save_creates_valid_json(tmp_path: Path) -> None:
     config = EulerFilesConfig(
         scratch_base="$SCRATCH",
@@ -8,44 +8,50 @@ from unittest.mock import patch
 import pytest
 
 from euler_files.config import ApptainerConfig, EulerFilesConfig, VarConfig
-from euler_files.congruency import check_congruency, format_warnings
+from euler_files.congruency import CongruencyWarning, check_congruency, format_warnings
 
 
 class TestCheckCongruency:
-    def test_no_warnings_when_congruent(self, tmp_path: Path) -> None:
+    def test_no_warnings_when_congruent(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         source = tmp_path / "hf"
         source.mkdir()
         config = EulerFilesConfig(
             scratch_base=str(tmp_path),
             vars={"HF_HOME": VarConfig(source=str(source))},
         )
-        with patch.dict("os.environ", {"HF_HOME": str(source)}):
-            warnings = check_congruency(config)
+        monkeypatch.setenv("HF_HOME", str(source))
+        warnings = check_congruency(config)
         assert warnings == []
 
-    def test_warning_when_env_var_differs(self, tmp_path: Path) -> None:
+    def test_warning_when_env_var_differs(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         config = EulerFilesConfig(
             scratch_base=str(tmp_path),
             vars={"HF_HOME": VarConfig(source="/new/path/hf")},
         )
-        with patch.dict("os.environ", {"HF_HOME": "/old/path/hf"}):
-            warnings = check_congruency(config)
+        monkeypatch.setenv("HF_HOME", "/old/path/hf")
+        warnings = check_congruency(config)
         assert len(warnings) == 1
         assert warnings[0].var_name == "HF_HOME"
         assert warnings[0].env_value == "/old/path/hf"
         assert warnings[0].config_value == "/new/path/hf"
         assert "export HF_HOME=/new/path/hf" in warnings[0].message
 
-    def test_no_warning_when_env_var_unset(self) -> None:
+    def test_no_warning_when_env_var_unset(self, monkeypatch: pytest.MonkeyPatch) -> None:
         config = EulerFilesConfig(
             scratch_base="/scratch",
             vars={"HF_HOME": VarConfig(source="/some/path")},
         )
-        with patch.dict("os.environ", {}, clear=True):
-            warnings = check_congruency(config)
+        monkeypatch.delenv("HF_HOME", raising=False)
+        warnings = check_congruency(config)
         assert warnings == []
 
-    def test_multiple_vars_one_mismatch(self, tmp_path: Path) -> None:
+    def test_multiple_vars_one_mismatch(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         good_path = tmp_path / "torch"
         good_path.mkdir()
         config = EulerFilesConfig(
@@ -55,24 +61,22 @@ class TestCheckCongruency:
                 "HF_HOME": VarConfig(source="/new/hf"),
             },
         )
-        with patch.dict("os.environ", {
-            "TORCH_HOME": str(good_path),
-            "HF_HOME": "/old/hf",
-        }):
-            warnings = check_congruency(config)
+        monkeypatch.setenv("TORCH_HOME", str(good_path))
+        monkeypatch.setenv("HF_HOME", "/old/hf")
+        warnings = check_congruency(config)
         assert len(warnings) == 1
         assert warnings[0].var_name == "HF_HOME"
 
-    def test_disabled_var_skipped(self) -> None:
+    def test_disabled_var_skipped(self, monkeypatch: pytest.MonkeyPatch) -> None:
         config = EulerFilesConfig(
             scratch_base="/scratch",
             vars={"HF_HOME": VarConfig(source="/new/hf", enabled=False)},
         )
-        with patch.dict("os.environ", {"HF_HOME": "/old/hf"}):
-            warnings = check_congruency(config)
+        monkeypatch.setenv("HF_HOME", "/old/hf")
+        warnings = check_congruency(config)
         assert warnings == []
 
-    def test_path_normalization(self, tmp_path: Path) -> None:
+    def test_path_normalization(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
         """Paths that resolve to the same location should not warn."""
         source = tmp_path / "cache" / "hf"
         source.mkdir(parents=True)
@@ -82,11 +86,36 @@ class TestCheckCongruency:
             scratch_base=str(tmp_path),
             vars={"HF_HOME": VarConfig(source=str(source))},
         )
-        with patch.dict("os.environ", {"HF_HOME": alt_path}):
+        monkeypatch.setenv("HF_HOME", alt_path)
+        warnings = check_congruency(config)
+        assert warnings == []
+
+    def test_path_normalization_missing_paths(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Paths that don't exist yet are still compared in normalized form."""
+        missing = tmp_path / "not-created"
+        config = EulerFilesConfig(
+            scratch_base=str(tmp_path),
+            vars={"HF_HOME": VarConfig(source=str(missing / "hf"))},
+        )
+        monkeypatch.setenv("HF_HOME", str(missing / "x" / ".." / "hf"))
+        warnings = check_congruency(config)
+        assert warnings == []
+
+    def test_identical_paths_not_resolved(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        config = EulerFilesConfig(
+            scratch_base="/scratch",
+            vars={"HF_HOME": VarConfig(source="/home/user/.cache/hf")},
+        )
+        monkeypatch.setenv("HF_HOME", "/home/user/.cache/hf")
+        with patch("os.path.realpath", side_effect=AssertionError("resolved")):
             warnings = check_congruency(config)
         assert warnings == []
 
-    def test_apptainer_venv_base_missing_dir(self, tmp_path: Path) -> None:
+    def test_apptainer_venv_base_missing_dir(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         config = EulerFilesConfig(
             scratch_base=str(tmp_path),
             vars={},
@@ -94,13 +123,15 @@ class TestCheckCongruency:
                 venv_base="$TEST_VENV_DIR",
             ),
         )
-        with patch.dict("os.environ", {"TEST_VENV_DIR": str(tmp_path / "nonexistent")}):
-            warnings = check_congruency(config)
+        monkeypatch.setenv("TEST_VENV_DIR", str(tmp_path / "nonexistent"))
+        warnings = check_congruency(config)
         assert len(warnings) == 1
         assert "venv_base" in warnings[0].message
         assert "does not exist" in warnings[0].message
 
-    def test_apptainer_venv_base_exists(self, tmp_path: Path) -> None:
+    def test_apptainer_venv_base_exists(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         venv_dir = tmp_path / "venvs"
         venv_dir.mkdir()
         config = EulerFilesConfig(
@@ -110,8 +141,8 @@ class TestCheckCongruency:
                 venv_base="$TEST_VENV_DIR",
             ),
         )
-        with patch.dict("os.environ", {"TEST_VENV_DIR": str(venv_dir)}):
-            warnings = check_congruency(config)
+        monkeypatch.setenv("TEST_VENV_DIR", str(venv_dir))
+        warnings = check_congruency(config)
         assert warnings == []
 
     def test_apptainer_literal_path_not_checked(self) -> None:
@@ -132,8 +163,6 @@ class TestFormatWarnings:
         assert format_warnings([]) == ""
 
     def test_formats_warnings(self) -> None:
-        from euler_files.congruency import CongruencyWarning
-
         warnings = [
             CongruencyWarning(
                 var_name="HF_HOME",
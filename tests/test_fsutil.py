@@ -0,0 +1,183 @@
+"""Tests for filesystem helpers."""
+
+from __future__ import annotations
+
+import os
+import stat
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from euler_files.fsutil import atomic_write, dir_size, dir_size_display, format_size
+from euler_files.sizecache import SizeCache
+
+
+class TestFormatSize:
+    @pytest.mark.parametrize(
+        "size, expected",
+        [
+            (0, "0.0 B"),
+            (1, "1.0 B"),
+            (1023, "1023.0 B"),
+            (1024, "1.0 KB"),
+            (1536, "1.5 KB"),
+            (5 * 1024**3, "5.0 GB"),
+            (3 * 1024**5, "3.0 PB"),
+            (2048 * 1024**5, "2048.0 PB"),
+        ],
+    )
+    def test_units(self, size: int, expected: str) -> None:
+        assert format_size(size) == expected
+
+
+class TestDirSize:
+    def test_sums_tree(self, tmp_path: Path) -> None:
+        (tmp_path / "a" / "b").mkdir(parents=True)
+        (tmp_path / "a" / "f1").write_bytes(b"x" * 10000)
+        (tmp_path / "a" / "b" / "f2").write_bytes(b"x" * 10000)
+
+        size, complete = dir_size(tmp_path)
+
+        assert complete
+        assert size >= 20000
+
+    def test_counts_hardlinks_once(self, tmp_path: Path) -> None:
+        (tmp_path / "f1").write_bytes(b"x" * 100000)
+        single, _ = dir_size(tmp_path)
+        os.link(tmp_path / "f1", tmp_path / "f2")
+
+        linked, _ = dir_size(tmp_path)
+
+        assert linked == single
+
+    def test_budget_exhausted_is_lower_bound(self, tmp_path: Path) -> None:
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "f").write_bytes(b"x" * 10000)
+
+        size, complete = dir_size(tmp_path, budget=-1)
+
+        assert not complete
+
+    def test_display_marks_incomplete_size(self, tmp_path: Path) -> None:
+        with patch("euler_files.fsutil.dir_size", return_value=(2048, False)):
+            assert dir_size_display(tmp_path) == ">2.0 KB"
+
+
+    def test_stays_on_one_filesystem(self, tmp_path: Path) -> None:
+        (tmp_path / "mnt").mkdir()
+        (tmp_path / "mnt" / "f1").write_bytes(b"x" * 100000)
+        root_st = os.lstat(tmp_path)
+        # Pretend the root is on another device than everything below it,
+        # which is how a mount inside the tree looks from its parent.
+        fake_root = SimpleNamespace(st_blocks=root_st.st_blocks, st_dev=root_st.st_dev + 1)
+
+        with patch("euler_files.fsutil.os.lstat", return_value=fake_root):
+            size, complete = dir_size(tmp_path)
+
+        assert complete
+        assert size == root_st.st_blocks * 512
+
+
+class TestDirSizeCache:
+    def _tree(self, root: Path) -> None:
+        (root / "a" / "b").mkdir(parents=True)
+        (root / "a" / "f1").write_bytes(b"x" * 10000)
+        (root / "a" / "b" / "f2").write_bytes(b"x" * 10000)
+
+    def test_cached_walk_matches_uncached(self, tmp_path: Path) -> None:
+        self._tree(tmp_path / "tree")
+        cache = SizeCache(tmp_path / "cache.json", max_age=3600)
+
+        first = dir_size(tmp_path / "tree", cache=cache)
+        cache.save()
+        second = dir_size(
+            tmp_path / "tree", cache=SizeCache(tmp_path / "cache.json", max_age=3600)
+        )
+
+        assert first == second == dir_size(tmp_path / "tree")
+
+    def test_unchanged_dirs_not_relisted(self, tmp_path: Path) -> None:
+        self._tree(tmp_path / "tree")
+        cache = SizeCache(tmp_path / "cache.json", max_age=3600)
+        expected = dir_size(tmp_path / "tree", cache=cache)
+
+        with patch("euler_files.fsutil.os.scandir", side_effect=AssertionError("listed")):
+            assert dir_size(tmp_path / "tree", cache=cache) == expected
+
+    def test_change_in_nested_dir_picked_up(self, tmp_path: Path) -> None:
+        self._tree(tmp_path / "tree")
+        cache = SizeCache(tmp_path / "cache.json", max_age=3600)
+        before, _ = dir_size(tmp_path / "tree", cache=cache)
+
+        nested = tmp_path / "tree" / "a" / "b"
+        (nested / "f3").write_bytes(b"x" * 100000)
+        # Make sure the mtime moves even on coarse-timestamp filesystems.
+        st = nested.stat()
+        os.utime(nested, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+        after, _ = dir_size(tmp_path / "tree", cache=cache)
+        assert after == dir_size(tmp_path / "tree")[0]
+        assert after > before
+
+    def test_expired_records_dropped(self, tmp_path: Path) -> None:
+        self._tree(tmp_path / "tree")
+        cache = SizeCache(tmp_path / "cache.json", max_age=3600)
+        dir_size(tmp_path / "tree", cache=cache)
+        cache.save()
+
+        stale = SizeCache(tmp_path / "cache.json", max_age=-1)
+        assert stale.get(str(tmp_path / "tree"), (tmp_path / "tree").stat().st_mtime_ns) is None
+
+    def test_corrupt_cache_file_ignored(self, tmp_path: Path) -> None:
+        (tmp_path / "cache.json").write_text("{not json")
+        self._tree(tmp_path / "tree")
+
+        cache = SizeCache(tmp_path / "cache.json", max_age=3600)
+
+        assert dir_size(tmp_path / "tree", cache=cache) == dir_size(tmp_path / "tree")
+
+
+class TestAtomicWrite:
+    def test_replaces_contents(self, tmp_path: Path) -> None:
+        target = tmp_path / "marker"
+        target.write_bytes(b"old")
+
+        atomic_write(target, b"new")
+
+        assert target.read_bytes() == b"new"
+        assert [p.name for p in tmp_path.iterdir()] == ["marker"]
+
+    def test_failed_write_keeps_old_file(self, tmp_path: Path) -> None:
+        target = tmp_path / "marker"
+        target.write_bytes(b"old")
+
+        with patch("euler_files.fsutil.os.fsync", side_effect=OSError("disk gone")):
+            with pytest.raises(OSError):
+                atomic_write(target, b"new")
+
+        assert target.read_bytes() == b"old"
+        assert [p.name for p in tmp_path.iterdir()] == ["marker"]
+
+    def test_writes_through_symlink(self, tmp_path: Path) -> None:
+        real = tmp_path / "dotfiles" / "config.json"
+        real.parent.mkdir()
+        real.write_bytes(b"old")
+        link = tmp_path / "config.json"
+        link.symlink_to(real)
+
+        atomic_write(link, b"new")
+
+        assert link.is_symlink()
+        assert real.read_bytes() == b"new"
+        assert sorted(p.name for p in real.parent.iterdir()) == ["config.json"]
+
+    def test_keeps_file_mode(self, tmp_path: Path) -> None:
+        target = tmp_path / "config.json"
+        target.write_bytes(b"old")
+        target.chmod(0o600)
+
+        atomic_write(target, b"new")
+
+        assert stat.S_IMODE(target.stat().st_mode) == 0o600
@@ -5,7 +5,7 @@ from __future__ import annotations
 import fcntl
 import time
 from pathlib import Path
-from threading import Thread
+from threading import Event, Thread
 
 import pytest
 
@@ -25,35 +25,29 @@ def test_lock_creates_parent_dirs(tmp_path: Path) -> None:
         assert lock_path.exists()
 
 
-def test_lock_timeout() -> None:
+def test_lock_timeout(tmp_path: Path) -> None:
     """Should raise LockTimeout when lock is held."""
-    import tempfile
-
-    with tempfile.NamedTemporaryFile(suffix=".lock", delete=False) as f:
-        lock_path = Path(f.name)
+    lock_path = tmp_path / "test.lock"
 
     # Hold the lock from outside
-    holder = open(lock_path, "w")
-    fcntl.flock(holder.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
-
-    try:
+    with open(lock_path, "w") as holder:
+        fcntl.flock(holder.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
         with pytest.raises(LockTimeout):
-            with acquire_lock(lock_path, timeout=1, poll_interval=0.2):
+            with acquire_lock(lock_path, timeout=0.2, poll_interval=0.02):
                 pass  # Should not reach here
-    finally:
-        fcntl.flock(holder.fileno(), fcntl.LOCK_UN)
-        holder.close()
-        lock_path.unlink(missing_ok=True)
 
 
 def test_lock_contention_threads(tmp_path: Path) -> None:
     """Two threads competing for the same lock."""
     lock_path = tmp_path / "test.lock"
     results: list = []
+    t1_holds_lock = Event()
 
     def worker(worker_id: int, hold_time: float) -> None:
         with acquire_lock(lock_path, timeout=10, poll_interval=0.1):
             results.append((worker_id, "acquired", time.monotonic()))
+            if worker_id == 1:
+                t1_holds_lock.set()
             time.sleep(hold_time)
         results.append((worker_id, "released", time.monotonic()))
 
@@ -61,7 +55,7 @@ def test_lock_contention_threads(tmp_path: Path) -> None:
     t2 = Thread(target=worker, args=(2, 0.0))
 
     t1.start()
-    time.sleep(0.1)  # Ensure t1 gets lock first
+    assert t1_holds_lock.wait(timeout=10)  # t2 only starts once t1 has the lock
     t2.start()
 
     t1.join(timeout=10)
@@ -73,3 +67,37 @@ def test_lock_contention_threads(tmp_path: Path) -> None:
     assert acquire_events[0][0] == 1  # t1 acquired first
     assert acquire_events[1][0] == 2  # t2 acquired second
     assert acquire_events[1][1] > acquire_events[0][1]  # t2 later
+
+
+def test_error_in_locked_block_propagates(tmp_path: Path) -> None:
+    """An OSError raised while holding the lock must not be taken for contention."""
+    lock_path = tmp_path / "test.lock"
+    with pytest.raises(FileNotFoundError):
+        with acquire_lock(lock_path, timeout=5):
+            raise FileNotFoundError("inside")
+
+    # And the lock was released.
+    with acquire_lock(lock_path, timeout=1):
+        pass
+
+
+def test_sibling_thread_waits_without_polling(
+    tmp_path: Path, capsys: pytest.CaptureFixture
+) -> None:
+    """Threads of one process queue on the in-process lock, not on flock."""
+    lock_path = tmp_path / "test.lock"
+    acquired = []
+
+    def worker() -> None:
+        with acquire_lock(lock_path, timeout=10):
+            acquired.append(time.monotonic())
+
+    with acquire_lock(lock_path, timeout=5):
+        t = Thread(target=worker)
+        t.start()
+        time.sleep(0.3)
+        assert acquired == []
+    t.join(timeout=10)
+
+    assert len(acquired) == 1
+    assert "[LOCK] Waiting" not in capsys.readouterr().err
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import Callable
 from unittest.mock import patch, MagicMock
 
 import pytest
@@ -163,6 +164,13 @@ class TestRunMigrate:
                 config_path=config_path,
             )
 
+    def test_migrate_interactive_without_tty_raises(self, tmp_path: Path) -> None:
+        config_path = _make_config(tmp_path)
+
+        with patch("sys.stdin.isatty", return_value=False), \
+                pytest.raises(ValueError, match="needs a terminal"):
+            run_migrate(what="HF_HOME", yes=True, config_path=config_path)
+
     def test_migrate_unknown_var_raises(self, tmp_path: Path) -> None:
         config_path = _make_config(tmp_path)
 
@@ -212,28 +220,10 @@ class TestRunMigrate:
         loaded = load_config(path=config_path)
         assert loaded.apptainer.sif_store == str(new_dest)
 
+    @pytest.mark.parametrize("keep_old", [True, False])
     @patch("euler_files.migrate.run_rsync")
-    def test_migrate_keeps_old_directory(
-        self, mock_rsync: MagicMock, tmp_path: Path
-    ) -> None:
-        config_path = _make_config(tmp_path)
-        old_source = tmp_path / "hf_cache"
-        new_dest = tmp_path / "new_location"
-
-        run_migrate(
-            what="HF_HOME",
-            to_path=str(new_dest),
-            yes=True,
-            keep_old=True,
-            config_path=config_path,
-        )
-
-        # Old directory should still exist
-        assert old_source.exists()
-
-    @patch("euler_files.migrate.run_rsync")
-    def test_migrate_deletes_old_directory(
-        self, mock_rsync: MagicMock, tmp_path: Path
+    def test_migrate_old_directory_kept_or_removed(
+        self, mock_rsync: MagicMock, keep_old: bool, tmp_path: Path
     ) -> None:
         config_path = _make_config(tmp_path)
         old_source = tmp_path / "hf_cache"
@@ -243,43 +233,19 @@ class TestRunMigrate:
             what="HF_HOME",
             to_path=str(new_dest),
             yes=True,
-            keep_old=False,
+            keep_old=keep_old,
             config_path=config_path,
         )
 
-        # Old directory should be removed
-        assert not old_source.exists()
+        assert old_source.exists() == keep_old
 
 
 class TestFixupVenvs:
-    def _make_venv(self, base: Path, name: str) -> Path:
-        """Create a mock venv with hardcoded paths."""
-        venv = base / name
-        venv.mkdir(parents=True)
-        (venv / "pyvenv.cfg").write_text(
-            f"home = /usr/bin\nversion_info = 3.11.5\n"
-        )
-        bin_dir = venv / "bin"
-        bin_dir.mkdir()
-        # Activate script with VIRTUAL_ENV
-        (bin_dir / "activate").write_text(
-            f'VIRTUAL_ENV="{base}/{name}"\nexport VIRTUAL_ENV\n'
-        )
-        # pip script with shebang
-        (bin_dir / "pip").write_text(
-            f"#!/{base}/{name}/bin/python\nimport sys\n"
-        )
-        # python symlink (points to system python — unchanged by fixup)
-        (bin_dir / "python").write_text("#!/usr/bin/env python3\n")
-        # Binary file — should be skipped
-        (bin_dir / "data.bin").write_bytes(b"\x00\x01\x02\x03")
-        return venv
-
-    def test_fixup_rewrites_activate(self, tmp_path: Path) -> None:
+    def test_fixup_rewrites_activate(self, tmp_path: Path, make_venv: Callable[..., Path]) -> None:
         old_base = tmp_path / "old_venvs"
         new_base = tmp_path / "new_venvs"
         old_base.mkdir()
-        self._make_venv(old_base, "myenv")
+        make_venv(old_base, "myenv")
 
         # Simulate rsync by copying
         import shutil
@@ -291,11 +257,11 @@ class TestFixupVenvs:
         assert str(new_base / "myenv") in activate
         assert str(old_base / "myenv") not in activate
 
-    def test_fixup_rewrites_shebangs(self, tmp_path: Path) -> None:
+    def test_fixup_rewrites_shebangs(self, tmp_path: Path, make_venv: Callable[..., Path]) -> None:
         old_base = tmp_path / "old_venvs"
         new_base = tmp_path / "new_venvs"
         old_base.mkdir()
-        self._make_venv(old_base, "myenv")
+        make_venv(old_base, "myenv")
 
         import shutil
         shutil.copytree(old_base, new_base)
@@ -303,7 +269,7 @@ class TestFixupVenvs:
         _fixup_venvs(new_base, str(old_base), str(new_base))
 
         pip = (new_base / "myenv" / "bin" / "pip").read_text()
-        assert pip.startswith(f"#!/{new_base}/myenv/bin/python")
+        assert pip.startswith(f"#!{new_base}/myenv/bin/python")
         assert str(old_base) not in pip
         # Body preserved
         assert "import sys" in pip
@@ -319,11 +285,13 @@ class TestFixupVenvs:
         # Should not crash
         _fixup_venvs(new_base, "/old", str(new_base))
 
-    def test_fixup_skips_binary_files(self, tmp_path: Path) -> None:
+    def test_fixup_skips_binary_files(
+        self, tmp_path: Path, make_venv: Callable[..., Path]
+    ) -> None:
         old_base = tmp_path / "old"
         new_base = tmp_path / "new"
         old_base.mkdir()
-        self._make_venv(old_base, "env")
+        make_venv(old_base, "env")
 
         import shutil
         shutil.copytree(old_base, new_base)
@@ -332,14 +300,16 @@ class TestFixupVenvs:
 
         # Binary file should be untouched
         data = (new_base / "env" / "bin" / "data.bin").read_bytes()
-        assert data == b"\x00\x01\x02\x03"
+        assert data == b"\x00\x01\x02"
 
-    def test_fixup_handles_multiple_venvs(self, tmp_path: Path) -> None:
+    def test_fixup_handles_multiple_venvs(
+        self, tmp_path: Path, make_venv: Callable[..., Path]
+    ) -> None:
         old_base = tmp_path / "old"
         new_base = tmp_path / "new"
         old_base.mkdir()
-        self._make_venv(old_base, "env1")
-        self._make_venv(old_base, "env2")
+        make_venv(old_base, "env1")
+        make_venv(old_base, "env2")
 
         import shutil
         shutil.copytree(old_base, new_base)
@@ -350,3 +320,67 @@ class TestFixupVenvs:
             activate = (new_base / name / "bin" / "activate").read_text()
             assert str(new_base / name) in activate
             assert str(old_base / name) not in activate
+
+    def test_fixup_preserves_non_utf8_script_body(
+        self, tmp_path: Path, make_venv: Callable[..., Path]
+    ) -> None:
+        old_base = tmp_path / "old"
+        new_base = tmp_path / "new"
+        old_base.mkdir()
+        make_venv(old_base, "env")
+        body = b"# caf\xe9 latin-1 comment\n"
+        (old_base / "env" / "bin" / "tool").write_bytes(
+            f"#!{old_base}/env/bin/python\n".encode() + body
+        )
+
+        import shutil
+        shutil.copytree(old_base, new_base)
+
+        _fixup_venvs(new_base, str(old_base), str(new_base))
+
+        data = (new_base / "env" / "bin" / "tool").read_bytes()
+        assert data == f"#!{new_base}/env/bin/python\n".encode() + body
+
+    def test_fixup_non_utf8_base_path(self, tmp_path: Path) -> None:
+        import os
+
+        old_base = tmp_path / os.fsdecode(b"old-\xe9")
+        new_base = tmp_path / "new"
+        venv = new_base / "env"
+        (venv / "bin").mkdir(parents=True)
+        (venv / "pyvenv.cfg").write_text("version_info = 3.11.5\n")
+        old_venv = os.fsencode(old_base / "env")
+        (venv / "bin" / "activate").write_bytes(b'VIRTUAL_ENV="' + old_venv + b'"\n')
+        (venv / "bin" / "pip").write_bytes(b"#!" + old_venv + b"/bin/python\nimport sys\n")
+
+        _fixup_venvs(new_base, str(old_base), str(new_base))
+
+        new_venv = os.fsencode(venv)
+        assert (venv / "bin" / "activate").read_bytes() == b'VIRTUAL_ENV="' + new_venv + b'"\n'
+        assert (venv / "bin" / "pip").read_bytes().startswith(b"#!" + new_venv + b"/bin/python\n")
+
+    def test_fixup_skips_venv_already_at_new_location(
+        self, tmp_path: Path, make_venv: Callable[..., Path]
+    ) -> None:
+        new_base = tmp_path / "new"
+        new_base.mkdir()
+        make_venv(new_base, "env")
+
+        with patch("euler_files.migrate._rewrite_shebang") as mock_rewrite:
+            _fixup_venvs(new_base, str(tmp_path / "old"), str(new_base))
+
+        mock_rewrite.assert_not_called()
+
+
+def test_import_does_not_load_rich() -> None:
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, euler_files.migrate; "
+        "print(any(m == 'rich' or m.startswith('rich.') for m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
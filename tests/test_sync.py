@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import json
+import os
 import sys
 from pathlib import Path
 from unittest.mock import patch, MagicMock
@@ -10,6 +11,15 @@ from unittest.mock import patch, MagicMock
 import pytest
 
 from euler_files.config import EulerFilesConfig, VarConfig, save_config
+from euler_files.sync import _partition_tree, _shell_quote, run_sync
+
+
+@pytest.fixture
+def mock_rsync(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+    """Stand-in for the subprocess.run that euler_files.rsync calls."""
+    mock = MagicMock(return_value=MagicMock(returncode=0))
+    monkeypatch.setattr("euler_files.rsync.subprocess.run", mock)
+    return mock
 
 
 @pytest.fixture
@@ -34,13 +44,11 @@ def two_var_config(tmp_path: Path, tmp_scratch: Path, tmp_source: Path) -> Path:
     return config_path
 
 
-def test_sync_outputs_exports(sample_config: Path, capsys: pytest.CaptureFixture) -> None:
+def test_sync_outputs_exports(
+    mock_rsync: MagicMock, sample_config: Path, capsys: pytest.CaptureFixture
+) -> None:
     """Sync should print export statements to stdout."""
-    from euler_files.sync import run_sync
-
-    with patch("euler_files.rsync.subprocess.run") as mock_rsync:
-        mock_rsync.return_value = MagicMock(returncode=0)
-        run_sync(config_path=sample_config)
+    run_sync(config_path=sample_config)
 
     captured = capsys.readouterr()
     assert "export HF_HOME=" in captured.out
@@ -49,14 +57,10 @@ def test_sync_outputs_exports(sample_config: Path, capsys: pytest.CaptureFixture
 
 
 def test_sync_stdout_valid_shell(
-    two_var_config: Path, capsys: pytest.CaptureFixture
+    mock_rsync: MagicMock, two_var_config: Path, capsys: pytest.CaptureFixture
 ) -> None:
     """All stdout lines must be valid export statements."""
-    from euler_files.sync import run_sync
-
-    with patch("euler_files.rsync.subprocess.run") as mock_rsync:
-        mock_rsync.return_value = MagicMock(returncode=0)
-        run_sync(config_path=two_var_config)
+    run_sync(config_path=two_var_config)
 
     captured = capsys.readouterr()
     lines = [l for l in captured.out.strip().split("\n") if l]
@@ -66,25 +70,20 @@ def test_sync_stdout_valid_shell(
 
 
 def test_sync_creates_scratch_dirs(
-    sample_config: Path, tmp_scratch: Path, capsys: pytest.CaptureFixture
+    mock_rsync: MagicMock, sample_config: Path, tmp_scratch: Path, capsys: pytest.CaptureFixture
 ) -> None:
     """Sync should create the target directories."""
-    from euler_files.sync import run_sync
-
-    with patch("euler_files.rsync.subprocess.run") as mock_rsync:
-        mock_rsync.return_value = MagicMock(returncode=0)
-        run_sync(config_path=sample_config)
+    run_sync(config_path=sample_config)
 
     target = tmp_scratch / ".cache" / "euler-files" / "HF_HOME"
     assert target.is_dir()
 
 
-def test_sync_dry_run(sample_config: Path, capsys: pytest.CaptureFixture) -> None:
+def test_sync_dry_run(
+    mock_rsync: MagicMock, sample_config: Path, capsys: pytest.CaptureFixture
+) -> None:
     """Dry run should not call rsync."""
-    from euler_files.sync import run_sync
-
-    with patch("euler_files.rsync.subprocess.run") as mock_rsync:
-        run_sync(config_path=sample_config, dry_run=True)
+    run_sync(config_path=sample_config, dry_run=True)
 
     mock_rsync.assert_not_called()
     captured = capsys.readouterr()
@@ -93,14 +92,10 @@ def test_sync_dry_run(sample_config: Path, capsys: pytest.CaptureFixture) -> Non
 
 
 def test_sync_var_filter(
-    two_var_config: Path, capsys: pytest.CaptureFixture
+    mock_rsync: MagicMock, two_var_config: Path, capsys: pytest.CaptureFixture
 ) -> None:
     """--var should filter which vars are synced."""
-    from euler_files.sync import run_sync
-
-    with patch("euler_files.rsync.subprocess.run") as mock_rsync:
-        mock_rsync.return_value = MagicMock(returncode=0)
-        run_sync(config_path=two_var_config, only_vars=["HF_HOME"])
+    run_sync(config_path=two_var_config, only_vars=["HF_HOME"])
 
     captured = capsys.readouterr()
     assert "export HF_HOME=" in captured.out
@@ -111,8 +106,6 @@ def test_sync_missing_source(
     tmp_path: Path, tmp_scratch: Path, capsys: pytest.CaptureFixture
 ) -> None:
     """Missing source should warn but still emit export."""
-    from euler_files.sync import run_sync
-
     config = EulerFilesConfig(
         scratch_base=str(tmp_scratch),
         vars={"X": VarConfig(source="/nonexistent/path")},
@@ -128,19 +121,15 @@ def test_sync_missing_source(
 
 
 def test_sync_smart_skip(
-    sample_config: Path, tmp_scratch: Path, capsys: pytest.CaptureFixture
+    mock_rsync: MagicMock, sample_config: Path, tmp_scratch: Path, capsys: pytest.CaptureFixture
 ) -> None:
     """Second sync should skip if marker is fresh."""
-    from euler_files.sync import run_sync
+    # First sync
+    run_sync(config_path=sample_config)
+    capsys.readouterr()  # clear
 
-    with patch("euler_files.rsync.subprocess.run") as mock_rsync:
-        mock_rsync.return_value = MagicMock(returncode=0)
-        # First sync
-        run_sync(config_path=sample_config)
-        capsys.readouterr()  # clear
-
-        # Second sync — should skip
-        run_sync(config_path=sample_config)
+    # Second sync — should skip
+    run_sync(config_path=sample_config)
 
     captured = capsys.readouterr()
     assert "[SKIP]" in captured.err
@@ -148,20 +137,157 @@ def test_sync_smart_skip(
 
 
 def test_sync_force_ignores_skip(
-    sample_config: Path, capsys: pytest.CaptureFixture
+    mock_rsync: MagicMock, sample_config: Path, capsys: pytest.CaptureFixture
 ) -> None:
     """--force should rsync even when marker is fresh."""
-    from euler_files.sync import run_sync
+    # First sync
+    run_sync(config_path=sample_config)
+    capsys.readouterr()
 
-    with patch("euler_files.rsync.subprocess.run") as mock_rsync:
-        mock_rsync.return_value = MagicMock(returncode=0)
-        # First sync
-        run_sync(config_path=sample_config)
-        capsys.readouterr()
+    # Second sync with force
+    run_sync(config_path=sample_config, force=True)
 
-        # Second sync with force
-        run_sync(config_path=sample_config, force=True)
+    captured = capsys.readouterr()
+    assert "[SYNC]" in captured.err
+    assert "[SKIP]" not in captured.err
+
+
+def test_sync_corrupt_marker_resyncs(
+    mock_rsync: MagicMock, sample_config: Path, tmp_scratch: Path, capsys: pytest.CaptureFixture
+) -> None:
+    """A marker that isn't valid JSON (or UTF-8) must not skip the sync."""
+    marker = tmp_scratch / ".cache" / "euler-files" / ".HF_HOME.synced"
+    marker.parent.mkdir(parents=True)
+    marker.write_bytes(b"\xff\xfe{not json")
+
+    run_sync(config_path=sample_config)
 
     captured = capsys.readouterr()
     assert "[SYNC]" in captured.err
     assert "[SKIP]" not in captured.err
+
+
+def test_sync_skip_survives_dangling_symlink(
+    mock_rsync: MagicMock, sample_config: Path, tmp_source: Path, capsys: pytest.CaptureFixture
+) -> None:
+    """A dangling top-level symlink in the source must not defeat the smart skip."""
+    (tmp_source / "stale-link").symlink_to(tmp_source / "gone")
+
+    run_sync(config_path=sample_config)
+    capsys.readouterr()
+    run_sync(config_path=sample_config)
+
+    assert "[SKIP]" in capsys.readouterr().err
+
+
+def test_sync_stale_marker_not_parsed(
+    mock_rsync: MagicMock, sample_config: Path, tmp_scratch: Path, capsys: pytest.CaptureFixture
+) -> None:
+    """A marker whose mtime is outside the freshness window is ignored unread."""
+    run_sync(config_path=sample_config)
+    capsys.readouterr()
+
+    marker = tmp_scratch / ".cache" / "euler-files" / ".HF_HOME.synced"
+    old = marker.stat().st_mtime - 7200
+    os.utime(marker, (old, old))
+
+    with patch("euler_files.markers.json.loads", side_effect=AssertionError("parsed")):
+        run_sync(config_path=sample_config)
+
+    assert "[SYNC]" in capsys.readouterr().err
+
+
+def test_partition_tree_balances_entries(tmp_path: Path) -> None:
+    for name, size in [
+        ("big", 400_000), ("mid", 200_000), ("small1", 100_000), ("small2", 100_000)
+    ]:
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "blob").write_bytes(b"x" * size)
+
+    parts = _partition_tree(tmp_path, 2)
+
+    assert sorted(map(sorted, parts)) == [
+        [Path("big")],
+        [Path("mid"), Path("small1"), Path("small2")],
+    ]
+
+
+def test_partition_tree_splits_few_top_level_dirs(tmp_path: Path) -> None:
+    for name in ("models--a", "models--b", "models--c"):
+        (tmp_path / "hub" / name).mkdir(parents=True)
+        (tmp_path / "hub" / name / "blob").write_bytes(b"x" * 100_000)
+    (tmp_path / "token").write_text("secret")
+
+    parts = _partition_tree(tmp_path, 3)
+
+    assert len(parts) == 3
+    listed = sorted(p for part in parts for p in part)
+    assert listed == [
+        Path("hub/models--a"), Path("hub/models--b"), Path("hub/models--c"), Path("token")
+    ]
+
+
+def test_partition_tree_sizing_budget_exhausted(tmp_path: Path) -> None:
+    for name in ("a", "b", "c"):
+        (tmp_path / name / "deep").mkdir(parents=True)
+        (tmp_path / name / "deep" / "blob").write_bytes(b"x" * 1000)
+
+    with patch("euler_files.sync._PARTITION_SIZE_BUDGET", 0.0):
+        parts = _partition_tree(tmp_path, 2)
+
+    # Sizes are partial, but every entry is still assigned exactly once.
+    assert sorted(p for part in parts for p in part) == [Path("a"), Path("b"), Path("c")]
+
+
+def test_sync_intra_var_parallelism_uses_files_from(
+    mock_rsync: MagicMock, tmp_path: Path, tmp_scratch: Path, tmp_source: Path
+) -> None:
+    config = EulerFilesConfig(
+        scratch_base=str(tmp_scratch),
+        vars={"HF_HOME": VarConfig(source=str(tmp_source))},
+        parallel_jobs=1,
+        intra_var_parallelism=2,
+    )
+    config_path = tmp_path / "config.json"
+    save_config(config, path=config_path)
+
+    lists = []
+
+    def fake_run(cmd, **kwargs):
+        arg = next(a for a in cmd if a.startswith("--files-from="))
+        lists.append(Path(arg.split("=", 1)[1]).read_bytes().split(b"\0"))
+        return MagicMock(returncode=0)
+
+    mock_rsync.side_effect = fake_run
+    run_sync(config_path=config_path)
+
+    assert len(lists) == 2
+    assert sorted(p for names in lists for p in names) == [b"config.json", b"model.bin", b"subdir"]
+
+
+def test_sync_path_does_not_load_rich() -> None:
+    """`eval $(euler-files sync)` runs in every shell; keep rich off its path."""
+    import subprocess
+
+    code = (
+        "import sys, euler_files.cli, euler_files.sync, euler_files.congruency; "
+        "print(any(m == 'rich' or m.startswith('rich.') for m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("/scratch/.cache/euler-files/HF_HOME", "/scratch/.cache/euler-files/HF_HOME"),
+        ("/scratch/my cache", "'/scratch/my cache'"),
+        ("/scratch/it's", "'/scratch/it'\\''s'"),
+        ("/scratch/café", "'/scratch/café'"),
+        ("", "''"),
+    ],
+)
+def test_shell_quote(value: str, expected: str) -> None:
+    assert _shell_quote(value) == expected
@@ -0,0 +1,43 @@
+"""Tests for the setup wizard helpers."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from unittest.mock import patch
+
+from euler_files.config import VarConfig
+from euler_files.wizard import _warn_overlaps
+
+
+def _warnings(vars_config: dict) -> list:
+    with patch("euler_files.wizard.console") as console:
+        _warn_overlaps(vars_config)
+    return [c.args[0] for c in console.print.call_args_list]
+
+
+class TestWarnOverlaps:
+    def test_no_overlap(self, tmp_path: Path) -> None:
+        assert _warnings({
+            "A": VarConfig(source=str(tmp_path / "a")),
+            "AB": VarConfig(source=str(tmp_path / "ab")),
+        }) == []
+
+    def test_nested_sources_warned_once_each(self, tmp_path: Path) -> None:
+        messages = _warnings({
+            "HF_HOME": VarConfig(source=str(tmp_path / "hf")),
+            "HF_HUB_CACHE": VarConfig(source=str(tmp_path / "hf" / "hub")),
+            "HF_DATASETS_CACHE": VarConfig(source=str(tmp_path / "hf" / "datasets")),
+            "TORCH_HOME": VarConfig(source=str(tmp_path / "torch")),
+        })
+
+        assert len(messages) == 2
+        assert all("Consider managing only HF_HOME" in m for m in messages)
+
+    def test_deep_nesting_warns_for_every_ancestor(self, tmp_path: Path) -> None:
+        messages = _warnings({
+            "C": VarConfig(source=str(tmp_path / "a" / "b" / "c")),
+            "A": VarConfig(source=str(tmp_path / "a")),
+            "B": VarConfig(source=str(tmp_path / "a" / "b")),
+        })
+
+        assert len(messages) == 3